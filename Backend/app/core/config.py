@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     APP_TIMEZONE: str = "Asia/Kolkata"  # Default to IST
     
     DATABASE_URL: str = ""
+    SUPABASE_PREPARED_STATEMENTS: bool = False  # Set True when the pooler runs PgBouncer 1.21+ with max_prepared_statements > 0
     
     SECRET_KEY: str = "SECRET_KEY"
     ALGORITHM: str = "HS256"
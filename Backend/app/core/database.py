@@ -1,8 +1,11 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool
 from app.core.config import get_settings
 import ssl
+from contextlib import asynccontextmanager
+from uuid import uuid4
 
 settings = get_settings()
 
@@ -12,51 +15,76 @@ if not db_url:
     print("WARNING: DATABASE_URL not set. Using in-memory SQLite.")
     db_url = "sqlite+aiosqlite:///:memory:"
 
-# Initialize engine
-engine = None
+_PERMISSIVE_SSL = None
 
-try:
-    connect_args = {}
-    poolclass = None
+
+def _get_permissive_ssl_context() -> ssl.SSLContext:
+    """Permissive SSL context for Supabase, built once and shared by every engine."""
+    global _PERMISSIVE_SSL
+    if _PERMISSIVE_SSL is None:
+        _PERMISSIVE_SSL = ssl.create_default_context()
+        _PERMISSIVE_SSL.check_hostname = False
+        _PERMISSIVE_SSL.verify_mode = ssl.CERT_NONE
+    return _PERMISSIVE_SSL
+
+
+def build_engine(db_url: str, settings) -> AsyncEngine:
+    """Create the async engine with connect args and pooling tuned for the target database."""
+    # Analytics and sync reuse a few hundred statement shapes; a larger compiled
+    # cache than the default 500 keeps them from evicting each other.
+    engine_kwargs = {"echo": False, "query_cache_size": 2000}
     
     if "sqlite" in db_url:
-        connect_args = {"check_same_thread": False}
-    else:
-        # PostgreSQL configuration
-        connect_args = {
-            "statement_cache_size": 0,  # Required for Supabase pooler
-            "server_settings": {"application_name": "grip_backend"},
-            "timeout": 20,
-            "command_timeout": 20
-        }
-        
-        # Supabase-specific configuration
-        if "supabase" in db_url.lower():
-            # Use NullPool for Supabase Transaction Pooler (port 6543)
-            if ":6543" in db_url:
-                poolclass = NullPool
-            
-            # Permissive SSL context for Supabase
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            connect_args["ssl"] = ssl_context
-
-    # Create engine
-    engine_kwargs = {"echo": False, "connect_args": connect_args}
-    
-    if poolclass is NullPool:
-        engine_kwargs["poolclass"] = NullPool
-    else:
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
         engine_kwargs.update({
             "pool_pre_ping": True,
             "pool_recycle": 300,
             "pool_size": 10,
             "max_overflow": 20,
         })
+        return create_async_engine(db_url, **engine_kwargs)
+    
+    # PostgreSQL configuration
+    connect_args = {
+        "server_settings": {"application_name": "grip_backend"},
+        "timeout": 20,
+        "command_timeout": 20
+    }
+    
+    if settings.SUPABASE_PREPARED_STATEMENTS:
+        # PgBouncer 1.21+ (max_prepared_statements > 0) tracks protocol-level
+        # prepared statements, so asyncpg's cache can stay on. Unique names
+        # avoid collisions between workers sharing a server connection.
+        connect_args["prepared_statement_name_func"] = lambda: f"__grip_{uuid4().hex}__"
+        connect_args["prepared_statement_cache_size"] = 500
+    else:
+        connect_args["statement_cache_size"] = 0  # Required for Supabase pooler
+    
+    # Supabase-specific configuration
+    if "supabase" in db_url.lower():
+        connect_args["ssl"] = _get_permissive_ssl_context()
     
-    engine = create_async_engine(db_url, **engine_kwargs)
+    engine_kwargs["connect_args"] = connect_args
     
+    # Keep a small pool of warm connections (also behind the Supabase
+    # Transaction Pooler on 6543) instead of a TCP+TLS handshake per request.
+    # No pre-ping: the extra SELECT 1 is left "idle in transaction" by PgBouncer.
+    # Stale connections are bounded by pool_recycle and invalidated by
+    # SQLAlchemy on disconnect, so the next checkout gets a fresh one.
+    engine_kwargs.update({
+        "pool_pre_ping": False,
+        "pool_recycle": 60,
+        "pool_size": 10,
+        "max_overflow": 5,
+        "pool_timeout": 30,
+    })
+    
+    return create_async_engine(db_url, **engine_kwargs)
+
+
+# Initialize engine
+try:
+    engine = build_engine(db_url, settings)
 except Exception as e:
     print(f"CRITICAL: Failed to create database engine: {e}")
     import traceback
@@ -80,3 +108,19 @@ class Base(DeclarativeBase):
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+@asynccontextmanager
+async def readonly_session():
+    """Session whose transaction is READ ONLY on Postgres (lets poolers route it to replicas)."""
+    async with AsyncSessionLocal() as session:
+        if engine.dialect.name == "postgresql":
+            # Must be the first statement of the (auto-begun) transaction
+            await session.execute(text("SET TRANSACTION READ ONLY"))
+        yield session
+
+
+# Dependency for endpoints that never write
+async def get_readonly_db():
+    async with readonly_session() as session:
+        yield session
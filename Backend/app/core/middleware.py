@@ -1,60 +1,115 @@
-from fastapi import Request, Response, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
-from jose import jwt, JWTError
+from typing import Optional
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import time
+from functools import lru_cache
+import jwt
+from jwt import InvalidTokenError, ExpiredSignatureError
 from app.core.config import get_settings
 
 settings = get_settings()
 import logging
 logger = logging.getLogger(__name__)
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+# str.startswith accepts a tuple, matching every prefix in a single call
+EXCEPTION_ROUTE_PREFIXES = tuple(settings.EXCEPTION_ROUTES)
+BEARER_PREFIX = "Bearer "
+
+
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> dict:
+    """Verify a token once; repeat requests with the same token skip the signature check.
+    Failures raise and are therefore never cached."""
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+def verify_token(token: str) -> dict:
+    payload = _decode_token(token)
+    # Cached payloads must still honour expiry
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise ExpiredSignatureError("Signature has expired")
+    return payload
+
+
+def _get_authorization_header(scope) -> Optional[str]:
+    # ASGI header names are lower-cased bytes; scan once instead of building a Headers object
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return value.decode("latin-1")
+    return None
+
+
+class AuthenticationMiddleware:
+    """Pure ASGI middleware: avoids the extra task and memory stream BaseHTTPMiddleware adds per request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
         # 1. Check for Bypass/Exception Routes
-        path = request.url.path
-        if any(path.startswith(route) for route in settings.EXCEPTION_ROUTES):
+        path = scope["path"]
+        if path.startswith(EXCEPTION_ROUTE_PREFIXES):
             logger.debug(f"Bypassing authentication for path: {path}")
-            return await call_next(request)
+            return await self.app(scope, receive, send)
         
         # 2. Extract Token
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
+        auth_header = _get_authorization_header(scope)
+        if not auth_header or not auth_header.startswith(BEARER_PREFIX):
             logger.warning(f"Authentication failed: Missing or invalid token for path {path}")
-            return JSONResponse(
+            response = ORJSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Not authenticated"}
             )
+            return await response(scope, receive, send)
         
-        token = auth_header.split(" ")[1]
+        token = auth_header[len(BEARER_PREFIX):]
         
         # 3. Validate Token
         try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            payload = verify_token(token)
             email: str = payload.get("sub")
             if email is None:
-                raise JWTError
-        except JWTError:
+                raise InvalidTokenError
+        except InvalidTokenError:
             logger.warning(f"Authentication failed: Invalid token for path {path}")
-            return JSONResponse(
+            response = ORJSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Could not validate credentials"}
             )
+            return await response(scope, receive, send)
             
         # 4. Stateless Authentication
         # We trust the token signature. We do NOT hit the DB here.
         # Downstream dependencies (get_current_user) will fetch the full user object if needed.
-        request.state.user_email = email
+        # request.state is backed by scope["state"].
+        scope.setdefault("state", {})["user_email"] = email
         # logger.debug(f"Token valid for {email}, proceeding statelessly for {path}")
         
         # 5. Process request
+        response_started = False
+        
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Response: %s for %s", message["status"], path)
+            await send(message)
+        
         try:
-            response = await call_next(request)
-            logger.info(f"Response: {response.status_code} for {path}")
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             logger.error(f"Error in middleware processing {path}: {e}", exc_info=True)
-            return JSONResponse(
+            if response_started:
+                # Headers already sent; nothing sensible can be returned
+                raise
+            response = ORJSONResponse(
                 status_code=500,
                 content={"detail": "Internal Server Error in Middleware", "msg": str(e)}
             )
-
+            await response(scope, receive, send)
@@ -2,31 +2,56 @@
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import AsyncSessionLocal
 from app.core.config import get_settings
 from app.features.wealth.service import WealthService
+from app.features.wealth.models import InvestmentHolding
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 scheduler = AsyncIOScheduler()
 
+PRICE_SYNC_BATCH_SIZE = 25
+PRICE_SYNC_STATEMENT_TIMEOUT = "30s"
+
 async def run_daily_price_sync():
     """
     Task to sync prices for all investment holdings.
     Runs daily.
+    Holdings are processed in batches, each in its own short-lived session,
+    so no single transaction outlives the pooler's idle/statement limits.
     """
     logger.info("Starting Daily Price Sync...")
-    async with AsyncSessionLocal() as db:
-        service = WealthService(db)
-        try:
-            # We need to implement sync_all_holdings in WealthService first
-            await service.sync_all_holdings_prices() 
-            logger.info("Daily Price Sync Completed Successfully.")
-        except Exception as e:
-            logger.error(f"Daily Price Sync Failed: {e}", exc_info=True)
+    try:
+        async with AsyncSessionLocal() as db:
+            stmt = select(InvestmentHolding.id).where(InvestmentHolding.ticker_symbol.isnot(None))
+            holding_ids = (await db.execute(stmt)).scalars().all()
+    except Exception as e:
+        logger.error(f"Daily Price Sync Failed: {e}", exc_info=True)
+        return
+    
+    failed_batches = 0
+    for start in range(0, len(holding_ids), PRICE_SYNC_BATCH_SIZE):
+        batch_ids = holding_ids[start:start + PRICE_SYNC_BATCH_SIZE]
+        async with AsyncSessionLocal() as db:
+            try:
+                service = WealthService(db)
+                await service.sync_all_holdings_prices(
+                    holding_ids=batch_ids,
+                    statement_timeout=PRICE_SYNC_STATEMENT_TIMEOUT
+                )
+            except Exception as e:
+                failed_batches += 1
+                logger.error(f"Daily Price Sync batch starting at {start} failed: {e}", exc_info=True)
+    
+    if failed_batches:
+        logger.error(f"Daily Price Sync finished with {failed_batches} failed batch(es).")
+    else:
+        logger.info("Daily Price Sync Completed Successfully.")
 
 def start_scheduler():
     """
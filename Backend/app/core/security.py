@@ -1,16 +1,42 @@
+import hashlib
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import jwt
+import jwt
 from passlib.context import CryptContext
 from app.core.config import get_settings
+from app.utils.cache import TTLCache
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+# argon2id tuned to roughly 25ms per hash; legacy bcrypt hashes still verify
+# and are flagged by needs_rehash() so they get upgraded on the next login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1
+)
+
+# Successful verifications, keyed by (stored hash, sha256 of the attempt), so
+# bursts of repeated logins skip the KDF. The stored hash carries its own
+# salt, so a password change naturally misses.
+_verified_cache = TTLCache(maxsize=10_000, ttl=5)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Bcrypt has a max length limit of 72 bytes, truncate input to avoid crash
-    return pwd_context.verify(plain_password[:72], hashed_password)
+    plain_password = plain_password[:72]
+    key = (hashed_password, hashlib.sha256(plain_password.encode()).digest())
+    if _verified_cache.get(key):
+        return True
+    valid = pwd_context.verify(plain_password, hashed_password)
+    if valid:
+        _verified_cache.set(key, True)
+    return valid
+
+def needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
 
 def get_password_hash(password: str) -> str:
     # Bcrypt has a max length limit of 72 bytes for passwords
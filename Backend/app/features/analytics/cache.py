@@ -0,0 +1,11 @@
+from uuid import UUID
+from app.utils.cache import TTLCache
+
+# Analytics responses keyed by (kind, user_id, ...). Entries also carry a
+# transaction version token, so new/deleted transactions miss automatically.
+analytics_cache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def invalidate_analytics_cache(user_id: UUID) -> None:
+    """Drop cached analytics for a user after bills, cards or goals change."""
+    analytics_cache.invalidate(lambda key: key[1] == user_id)
@@ -1,24 +1,25 @@
 from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.database import get_readonly_db
 from app.features.auth.deps import get_current_user
 from app.features.auth.models import User
 from app.features.analytics.schemas import (
     VarianceAnalysis,
     FrozenFundsBreakdown,
     SafeToSpendResponse,
-    MonthlySummaryResponse
+    MonthlySummaryResponse,
+    AnalyticsDashboardResponse
 )
-from app.features.analytics.service import AnalyticsService
+from app.features.analytics.service import AnalyticsService, get_analytics_service
 
 router = APIRouter()
 
 @router.get("/summary/", response_model=MonthlySummaryResponse)
 async def get_monthly_summary(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[AnalyticsService, Depends()],
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+    service: Annotated[AnalyticsService, Depends(get_analytics_service)],
     month: Optional[int] = Query(None, ge=1, le=12),
     year: Optional[int] = Query(None, ge=2000, le=2100),
     scope: str = Query("month", enum=["month", "year", "all"])
@@ -32,8 +33,8 @@ async def get_monthly_summary(
 @router.get("/variance/", response_model=VarianceAnalysis)
 async def get_variance_analysis(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[AnalyticsService, Depends()],
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+    service: Annotated[AnalyticsService, Depends(get_analytics_service)],
     month: Optional[int] = Query(None, ge=1, le=12),
     year: Optional[int] = Query(None, ge=2000, le=2100)
 ):
@@ -46,8 +47,8 @@ async def get_variance_analysis(
 @router.get("/burden/", response_model=FrozenFundsBreakdown)
 async def get_burden_calculation(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[AnalyticsService, Depends()]
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+    service: Annotated[AnalyticsService, Depends(get_analytics_service)]
 ):
     """
     Calculate total frozen funds (burden).
@@ -59,8 +60,8 @@ async def get_burden_calculation(
 @router.get("/safe-to-spend/", response_model=SafeToSpendResponse)
 async def get_safe_to_spend(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[AnalyticsService, Depends()]
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+    service: Annotated[AnalyticsService, Depends(get_analytics_service)]
 ):
     """
     Calculate safe-to-spend amount with AI-predicted buffer till salary (1st of next month).
@@ -70,3 +71,15 @@ async def get_safe_to_spend(
     return await service.calculate_safe_to_spend_amount(db, current_user.id)
 
 
+@router.get("/dashboard/", response_model=AnalyticsDashboardResponse)
+async def get_analytics_dashboard(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+    service: Annotated[AnalyticsService, Depends(get_analytics_service)],
+    month: Optional[int] = Query(None, ge=1, le=12),
+    year: Optional[int] = Query(None, ge=2000, le=2100)
+):
+    """
+    Get monthly summary, variance analysis and safe-to-spend in a single call.
+    """
+    return await service.get_dashboard(db, current_user.id, month, year)
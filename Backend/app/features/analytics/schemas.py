@@ -40,3 +40,8 @@ class MonthlySummaryResponse(BaseModel):
     year: int
     current_period_expense: Decimal = Decimal(0)
     prior_period_settlement: Decimal = Decimal(0)
+
+class AnalyticsDashboardResponse(BaseModel):
+    summary: MonthlySummaryResponse
+    variance: VarianceAnalysis
+    safe_to_spend: SafeToSpendResponse
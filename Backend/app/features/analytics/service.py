@@ -1,10 +1,11 @@
 import logging
 import asyncio
+from contextvars import ContextVar
 from uuid import UUID
 from decimal import Decimal
 from typing import Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case, bindparam, and_
 from app.features.transactions.models import Transaction, AccountType
 from app.features.goals.models import Goal
 from app.features.analytics.schemas import (
@@ -12,10 +13,11 @@ from app.features.analytics.schemas import (
     VarianceAnalysis,
     FrozenFundsBreakdown,
     SafeToSpendResponse,
-    MonthlySummaryResponse
+    MonthlySummaryResponse,
+    AnalyticsDashboardResponse
 )
-from app.features.bills.service import BillService
-from app.features.credit_cards.service import CreditCardService
+from app.features.bills.service import get_bill_service
+from app.features.credit_cards.service import get_credit_card_service
 from app.utils.finance_utils import (
     calculate_frozen_funds,
     calculate_safe_to_spend,
@@ -28,86 +30,259 @@ from app.utils.finance_utils import (
 
 from datetime import datetime, date, timedelta
 import zoneinfo
+from functools import lru_cache, wraps
 from app.core.config import get_settings
+from app.core.database import readonly_session
+from app.features.analytics.cache import analytics_cache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+DEBUG_BUFFER_MAX_ROWS = 200
+BURDEN_ROLLUP_TTL_SECONDS = 600
+
+# Analytics responses are built from already-typed server values (Decimals from
+# Numeric columns), so the success paths use model_construct() to skip validation.
+
+
+def _zero_variance() -> VarianceAnalysis:
+    """Response for periods with no spending in either month; a fresh instance per call, since it is mutable."""
+    return VarianceAnalysis.model_construct(
+        current_month_total=Decimal("0"),
+        last_month_total=Decimal("0"),
+        variance_amount=Decimal("0"),
+        variance_percentage=0.0,
+        category_breakdown={}
+    )
+
+
+# Categories that never count as discretionary spend in the safe-to-spend buffer
+_DISCRETIONARY_EXCLUDED = ("Income", "Investment", "Housing", "Bill Payment", "Transfer", "EMI", "Loan", "Insurance", "Misc")
+_EXPENSE_EXCLUDED = ("Income",)
+
+# Exclusion lists are bound as expanding parameters rather than inlined literals,
+# so the statement text and its cache key stay the same whatever values are sent
+_EXPENSE_EXCLUDED_PARAM = bindparam("expense_excluded", expanding=True)
+_DISCRETIONARY_EXCLUDED_PARAM = bindparam("discretionary_excluded", expanding=True)
+
+# Hot statements are built once at import with bound parameters, so each call
+# skips statement construction and hits SQLAlchemy's compiled cache directly.
+_VARIANCE_CURRENT = func.abs(func.sum(Transaction.amount).filter(
+    Transaction.transaction_date.between(bindparam("current_start"), bindparam("current_end"))
+))
+_VARIANCE_PREVIOUS = func.abs(func.sum(Transaction.amount).filter(
+    Transaction.transaction_date.between(bindparam("previous_start"), bindparam("previous_end"))
+))
+_VARIANCE_STMT = (
+    select(
+        Transaction.category,
+        _VARIANCE_CURRENT.label("current_total"),
+        _VARIANCE_PREVIOUS.label("previous_total"),
+        # Grand totals across categories, repeated on every row
+        func.sum(_VARIANCE_CURRENT).over().label("current_grand_total"),
+        func.sum(_VARIANCE_PREVIOUS).over().label("previous_grand_total")
+    )
+    .where(Transaction.user_id == bindparam("user_id"))
+    .where(Transaction.category.notin_(_EXPENSE_EXCLUDED_PARAM))
+    .where(Transaction.transaction_date >= bindparam("previous_start"))
+    .where(Transaction.transaction_date <= bindparam("current_end"))
+    .group_by(Transaction.category)
+)
+
+_PERIOD_TOTALS_STMT = (
+    select(
+        func.sum(case((Transaction.category == "Income", Transaction.amount), else_=0)).label("income"),
+        func.sum(case((Transaction.category != "Income", Transaction.amount), else_=0)).label("expense"),
+        func.sum(case((Transaction.sub_category == "Credit Card Payment", Transaction.amount), else_=0)).label("cc_settlement"),
+        func.sum(Transaction.amount).label("net_balance")
+    )
+    .where(Transaction.user_id == bindparam("user_id"))
+    .where(Transaction.transaction_date >= bindparam("start_date"))
+    .where(Transaction.transaction_date <= bindparam("end_date"))
+)
+
+# Discretionary spend inside the [window_start, window_end] buffer window
+_DISCRETIONARY_FILTER = and_(
+    Transaction.category.notin_(_DISCRETIONARY_EXCLUDED_PARAM),
+    Transaction.sub_category != "Credit Card Payment",
+    Transaction.is_surety == False,
+    func.abs(Transaction.amount) <= 5000,  # Exclude large one-off purchases > 5k
+    Transaction.transaction_date >= bindparam("window_start"),
+    Transaction.transaction_date <= bindparam("window_end")
+)
+
+# Liquid balance (bank/cash), overall transaction count (new vs existing users)
+# and the discretionary spend for the buffer window
+_SAFE_TO_SPEND_STMT = (
+    select(
+        func.sum(Transaction.amount).filter(
+            Transaction.account_type.in_([AccountType.CASH, AccountType.SAVINGS])
+        ).label("balance"),
+        func.count(Transaction.id).label("txn_count"),
+        func.sum(Transaction.amount).filter(_DISCRETIONARY_FILTER).label("discretionary")
+    )
+    .where(Transaction.user_id == bindparam("user_id"))
+)
+
+_DEBUG_BUFFER_SUMMARY_STMT = (
+    select(
+        func.sum(func.abs(Transaction.amount)).label("total"),
+        func.count(Transaction.id).label("count")
+    )
+    .where(Transaction.user_id == bindparam("user_id"))
+    .where(_DISCRETIONARY_FILTER)
+)
+
+# Cheap change token for a user's transactions: new, deleted or re-priced rows change it
+_VERSION_TOKEN_STMT = (
+    select(
+        func.count(Transaction.id),
+        func.max(Transaction.created_at),
+        func.sum(Transaction.amount)
+    )
+    .where(Transaction.user_id == bindparam("user_id"))
+)
+
+
+# Set by a cached method's own error fallback so its degraded response is never
+# cached. Only the method's task sees it: a callee reports failure by its return value.
+_skip_cache: ContextVar[bool] = ContextVar("analytics_skip_cache", default=False)
+
+# Today's date pinned for one analytics call; gathered sub-tasks inherit it, so
+# a request reads the timezone clock once (and can't straddle midnight)
+_request_today: ContextVar[Optional[date]] = ContextVar("analytics_request_today", default=None)
+
+# (user_id, version token) pinned for one analytics call, so the sections of a
+# dashboard load share a single _VERSION_TOKEN_STMT round trip
+_request_version: ContextVar[Optional[tuple]] = ContextVar("analytics_request_version", default=None)
+
+
+def _freeze(value):
+    """Make call arguments hashable for use in a cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    return value
+
+
+async def _version_token(db: AsyncSession, user_id: UUID) -> tuple:
+    """The user's transaction version token, reusing the one pinned for this call."""
+    pinned = _request_version.get()
+    if pinned is not None and pinned[0] == user_id:
+        return pinned[1]
+    return tuple((await db.execute(_VERSION_TOKEN_STMT, {"user_id": user_id})).one())
+
+
+def _versioned_cache(kind: str, versioned: bool = True, ttl: Optional[float] = None):
+    """
+    Cache a `method(self, db, user_id, ...)` result in `analytics_cache`, keyed by
+    its arguments, today's date and the user's transaction version token.
+    With `versioned=False` the token query is skipped and the entry lives until
+    `ttl` expires or a write hook calls `invalidate_analytics_cache`.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(self, db: AsyncSession, user_id: UUID, *args, **kwargs):
+            today = self._get_today()
+            token = None
+            if versioned:
+                token = await _version_token(db, user_id)
+            key = (
+                kind,
+                user_id,
+                today,
+                tuple(_freeze(a) for a in args),
+                tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())),
+                token
+            )
+            cached = analytics_cache.get(key)
+            if cached is not None:
+                return cached
+            skip_token = _skip_cache.set(False)
+            today_token = _request_today.set(today)
+            try:
+                result = await fn(self, db, user_id, *args, **kwargs)
+                if result is not None and not _skip_cache.get():
+                    analytics_cache.set(key, result, ttl=ttl)
+            finally:
+                _request_today.reset(today_token)
+                _skip_cache.reset(skip_token)
+            return result
+        return wrapper
+    return decorator
+
+
+def _zero_burden() -> FrozenFundsBreakdown:
+    """Safe zeros for when the burden can't be computed, to prevent a 500."""
+    zero = Decimal("0.00")
+    return FrozenFundsBreakdown(
+        unpaid_bills=zero,
+        projected_surety=zero,
+        unbilled_cc=zero,
+        active_goals=zero,
+        total_frozen=zero
+    )
+
 
 class AnalyticsService:
     
     def __init__(self):
-        self.bill_service = BillService()
-        self.cc_service = CreditCardService()
+        self.bill_service = get_bill_service()
+        self.cc_service = get_credit_card_service()
         self._tz = zoneinfo.ZoneInfo(settings.APP_TIMEZONE)
 
     def _get_today(self) -> date:
-        """Get current date in the configured timezone."""
+        """Get current date in the configured timezone (pinned per call when available)."""
+        pinned = _request_today.get()
+        if pinned is not None:
+            return pinned
         return datetime.now(self._tz).date()
     
+    def _resolve_target_date(self, month: Optional[int], year: Optional[int]) -> date:
+        """First of the requested month, or today when no period is given."""
+        if month and year:
+            return date(year, month, 1)
+        return self._get_today()
+    
+    @_versioned_cache("variance")
     async def get_variance_analysis(
         self,
         db: AsyncSession,
         user_id: UUID,
         month: Optional[int] = None,
-        year: Optional[int] = None
+        year: Optional[int] = None,
+        month_range: Optional[Dict[str, date]] = None
     ) -> VarianceAnalysis:
-        """Calculate period vs previous period variance."""
-        target_date = self._get_today()
-        if month and year:
-            target_date = date(year, month, 1)
+        """Calculate period vs previous period variance.
+        A precomputed `month_range` (from get_month_date_range) skips re-resolving the period."""
+        if month_range is None:
+            month_range = get_month_date_range(self._resolve_target_date(month, year))
             
-        current_range = get_month_date_range(target_date)
-        previous_range = get_previous_month_date_range(target_date)
-        
-        # Current month spending
-        # Prepare Current month spending query
-        current_stmt = (
-            select(
-                Transaction.category,
-                func.sum(Transaction.amount).label("total")
-            )
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.category.notin_(["Income"]))
-            .where(Transaction.transaction_date >= current_range["month_start"])
-            .where(Transaction.transaction_date <= current_range["month_end"])
-            .group_by(Transaction.category)
-        )
-        
-        # Prepare Previous month spending query
-        previous_stmt = (
-            select(
-                Transaction.category,
-                func.sum(Transaction.amount).label("total")
-            )
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.category.notin_(["Income"]))
-            .where(Transaction.transaction_date >= previous_range["month_start"])
-            .where(Transaction.transaction_date <= previous_range["month_end"])
-            .group_by(Transaction.category)
-        )
-        
-        # Execute sequentially
-        current_result = await db.execute(current_stmt)
-        previous_result = await db.execute(previous_stmt)
-        
-        current_by_category = {row.category: abs(row.total or Decimal("0")) for row in current_result.all()}
-        current_total = sum(current_by_category.values())
+        current_range = month_range
+        previous_range = get_previous_month_date_range(current_range["month_start"])
         
-        previous_by_category = {row.category: abs(row.total or Decimal("0")) for row in previous_result.all()}
-        previous_total = sum(previous_by_category.values())
+        # Current and previous month spending in a single round-trip
+        result = await db.execute(_VARIANCE_STMT, {
+            "user_id": user_id,
+            "expense_excluded": _EXPENSE_EXCLUDED,
+            "current_start": current_range["month_start"],
+            "current_end": current_range["month_end"],
+            "previous_start": previous_range["month_start"],
+            "previous_end": previous_range["month_end"]
+        })
         
-        # Calculate category-level variance
-        all_categories = set(current_by_category.keys()) | set(previous_by_category.keys())
+        # Per-category and grand totals arrive already aggregated (as absolute values)
+        rows = result.all()
+        if not rows:
+            return _zero_variance()
         category_breakdown = {}
         
-        for category in all_categories:
-            current_amount = current_by_category.get(category, Decimal("0"))
-            previous_amount = previous_by_category.get(category, Decimal("0"))
+        for row in rows:
+            current_amount = row.current_total or Decimal("0")
+            previous_amount = row.previous_total or Decimal("0")
             variance_amt = current_amount - previous_amount
             variance_pct = calculate_variance_percentage(current_amount, previous_amount)
             
-            category_breakdown[category] = CategoryVariance(
+            category_breakdown[row.category] = CategoryVariance.model_construct(
                 current=current_amount,
                 previous=previous_amount,
                 variance_amount=variance_amt,
@@ -115,17 +290,17 @@ class AnalyticsService:
                 trend=get_trend_indicator(variance_pct)
             )
         
+        current_total = rows[0].current_grand_total or Decimal("0")
+        previous_total = rows[0].previous_grand_total or Decimal("0")
+        
         # Overall variance
         total_variance = current_total - previous_total
-        total_variance_pct = calculate_variance_percentage(
-            Decimal(str(current_total)),
-            Decimal(str(previous_total))
-        )
+        total_variance_pct = calculate_variance_percentage(current_total, previous_total)
         
-        return VarianceAnalysis(
-            current_month_total=Decimal(str(current_total)),
-            last_month_total=Decimal(str(previous_total)),
-            variance_amount=Decimal(str(total_variance)),
+        return VarianceAnalysis.model_construct(
+            current_month_total=current_total,
+            last_month_total=previous_total,
+            variance_amount=total_variance,
             variance_percentage=total_variance_pct,
             category_breakdown=category_breakdown
         )
@@ -135,48 +310,56 @@ class AnalyticsService:
         db: AsyncSession,
         user_id: UUID
     ) -> FrozenFundsBreakdown:
-        """Calculate total frozen funds (burden)."""
+        """Calculate total frozen funds (burden); zeros if it can't be computed."""
+        return await self._get_burden(db, user_id) or _zero_burden()
+    
+    # Per-user burden rollup: bill, card, goal and transaction writes all call
+    # invalidate_analytics_cache, so it doesn't need the per-read version token
+    @_versioned_cache("burden", versioned=False, ttl=BURDEN_ROLLUP_TTL_SECONDS)
+    async def _get_burden(
+        self,
+        db: AsyncSession,
+        user_id: UUID
+    ) -> Optional[FrozenFundsBreakdown]:
+        """Total frozen funds, or None when a lookup failed (never cached)."""
         try:
-            # Unpaid bills
+            # Small indexed lookups, run one after another on `db`: a session per
+            # lookup would cost more pooled connections than the overlap saves
             unpaid_bills = await self.bill_service.get_unpaid_bills_total(db, user_id)
             projected_surety = await self.bill_service.get_projected_surety_bills(db, user_id, days_ahead=30)
             unbilled_cc = await self.cc_service.get_all_unbilled_for_user(db, user_id)
+            active_goals = await self._get_active_goals_total(db, user_id)
             
-            # Monthly Goal contribution
-            active_goals = 0.0
-            try:
-                goal_stmt = (
-                    select(func.sum(Goal.monthly_contribution))
-                    .where(Goal.user_id == user_id)
-                    .where(Goal.is_active == True)
-                )
-                goal_res = await db.execute(goal_stmt)
-                active_goals = goal_res.scalar() or 0.0
-            except Exception as e:
-                logger.warning(f"Failed to calculate goals: {e}")
-                active_goals = 0.0
+            total_frozen = calculate_frozen_funds(unpaid_bills, projected_surety, unbilled_cc) + active_goals
             
-            total_frozen = calculate_frozen_funds(unpaid_bills, projected_surety, unbilled_cc) + Decimal(str(active_goals))
-            
-            return FrozenFundsBreakdown(
+            return FrozenFundsBreakdown.model_construct(
                 unpaid_bills=unpaid_bills,
                 projected_surety=projected_surety,
                 unbilled_cc=unbilled_cc,
-                active_goals=Decimal(str(active_goals)),
+                active_goals=active_goals,
                 total_frozen=total_frozen
             )
         except Exception as e:
             logger.error(f"Error calculating burden: {e}")
-            # Return safe zeros to prevent 500
-            zero = Decimal("0.00")
-            return FrozenFundsBreakdown(
-                unpaid_bills=zero,
-                projected_surety=zero,
-                unbilled_cc=zero,
-                active_goals=zero,
-                total_frozen=zero
-            )
+            return None
+    
+    async def _get_active_goals_total(self, db: AsyncSession, user_id: UUID) -> Decimal:
+        """Monthly Goal contribution. Failures propagate, so the burden is reported as degraded."""
+        goal_stmt = (
+            select(func.sum(Goal.monthly_contribution))
+            .where(Goal.user_id == user_id)
+            .where(Goal.is_active == True)
+        )
+        total = (await db.execute(goal_stmt)).scalar()
+        # Float column: convert via str so the Decimal carries the float's shortest repr
+        return Decimal(str(total)) if total else Decimal("0")
     
+    async def _run_in_session(self, fn, *args, **kwargs):
+        """Run a read-only `fn(db, ...)` coroutine on a dedicated session so it can overlap other queries."""
+        async with readonly_session() as session:
+            return await fn(session, *args, **kwargs)
+    
+    @_versioned_cache("safe_to_spend")
     async def calculate_safe_to_spend_amount(
         self,
         db: AsyncSession,
@@ -185,59 +368,56 @@ class AnalyticsService:
         """Calculate safe-to-spend amount with frozen funds and AI-predicted buffer till salary."""
         try:
             # Calculate days till salary (1st of next month)
+            # (on the 1st, salary is assumed received and the buffer spans the whole month)
             today = self._get_today()
-            if today.day == 1:
-                # If today is 1st, assume salary already received, buffer till next month's 1st
-                days_till_salary = 30  # Approximate
+            if today.month == 12:
+                salary_date = date(today.year + 1, 1, 1)
             else:
-                # Days remaining in current month
-                import calendar
-                _, last_day = calendar.monthrange(today.year, today.month)
-                days_till_salary = last_day - today.day + 1
-            
-            # Get current balance (liquid balance across bank/cash)
-            balance_stmt = (
-                select(func.sum(Transaction.amount))
-                .where(Transaction.user_id == user_id)
-                .where(Transaction.account_type.in_([AccountType.CASH, AccountType.SAVINGS]))
-            )
-            balance_result = await db.execute(balance_stmt)
-            frozen_breakdown = await self.calculate_burden(db, user_id)
-            
-            current_balance = balance_result.scalar() or Decimal("0")
-            
-            # Check if user has any transactions at all (to distinguish new vs existing users)
-            txn_count_stmt = (
-                select(func.count(Transaction.id))
-                .where(Transaction.user_id == user_id)
-            )
-            txn_count_result = await db.execute(txn_count_stmt)
-            total_transactions = txn_count_result.scalar() or 0
-            is_new_user = total_transactions == 0
+                salary_date = date(today.year, today.month + 1, 1)
+            days_till_salary = (salary_date - today).days
             
             # Calculate buffer using simple average of discretionary spending
             # Get discretionary expenses from last 30 days
-            today_date = self._get_today()
+            today_date = today
             thirty_days_ago = today_date - timedelta(days=30)
             
-            discretionary_stmt = (
-                select(func.sum(Transaction.amount))
-                .where(Transaction.user_id == user_id)
-                .where(Transaction.category.notin_(["Income", "Investment", "Housing", "Bill Payment", "Transfer", "EMI", "Loan", "Insurance", "Misc"]))
-                .where(Transaction.sub_category != "Credit Card Payment")
-                .where(Transaction.is_surety == False)
-                .where(func.abs(Transaction.amount) <= 5000)  # Exclude large one-off purchases > 5k
-                .where(Transaction.transaction_date >= thirty_days_ago)
-                .where(Transaction.transaction_date <= today_date)
-            )
-            discretionary_result = await db.execute(discretionary_stmt)
-            total_discretionary_30d = abs(discretionary_result.scalar() or Decimal("0"))
+            # Current balance (liquid balance across bank/cash), the overall transaction
+            # count (to distinguish new vs existing users) and the 30-day discretionary
+            # spend in one query; the burden follows on the same session.
+            balance_row = (await db.execute(_SAFE_TO_SPEND_STMT, {
+                "user_id": user_id,
+                "discretionary_excluded": _DISCRETIONARY_EXCLUDED,
+                "window_start": thirty_days_ago,
+                "window_end": today_date
+            })).one()
+            frozen_breakdown = await self._get_burden(db, user_id)
+            if frozen_breakdown is None:
+                # Degraded to zero frozen funds: serve it, but don't cache it
+                _skip_cache.set(True)
+                frozen_breakdown = _zero_burden()
+            
+            # No transactions yet: nothing to buffer or spend, skip the arithmetic
+            if not balance_row.txn_count:
+                zero = Decimal("0")
+                return SafeToSpendResponse.model_construct(
+                    current_balance=zero,
+                    frozen_funds=frozen_breakdown,
+                    buffer_amount=zero,
+                    buffer_percentage=0.0,
+                    safe_to_spend=zero,
+                    recommendation="👋 Welcome! Add your first transaction to start tracking your finances.",
+                    status="success"
+                )
+            
+            current_balance = balance_row.balance or Decimal("0")
+            
+            total_discretionary_30d = abs(balance_row.discretionary or Decimal("0"))
             
             # Calculate average daily discretionary expense
             avg_daily_discretionary = total_discretionary_30d / Decimal("30")
             
             # Buffer = Average daily discretionary × days till salary
-            buffer = avg_daily_discretionary * Decimal(str(days_till_salary))
+            buffer = avg_daily_discretionary * days_till_salary
             
             # Only enforce minimum buffer if user has positive balance
             if current_balance > 0:
@@ -264,17 +444,12 @@ class AnalyticsService:
             buffer_percentage = float(buffer / current_balance) if current_balance > 0 else 0.0
             
             # Format salary date for display
-            next_month = today.replace(day=1) + timedelta(days=32)
-            salary_date = next_month.replace(day=1)
             salary_str = salary_date.strftime("%b %d")
             
             # Generate recommendation based on user state
             status = "success"
             
-            if is_new_user:
-                recommendation = "👋 Welcome! Add your first transaction to start tracking your finances."
-                status = "success"
-            elif current_balance < 0:
+            if current_balance < 0:
                 deficit = abs(current_balance)
                 recommendation = f"📉 Balance is ₹{deficit:.0f} in deficit. Add income to recover."
                 status = "negative"
@@ -292,7 +467,7 @@ class AnalyticsService:
                 recommendation = f"✅ Healthy! ₹{buffer:.0f} buffered till salary ({salary_str})"
                 status = "success"
             
-            return SafeToSpendResponse(
+            return SafeToSpendResponse.model_construct(
                 current_balance=current_balance,
                 frozen_funds=frozen_breakdown,
                 buffer_amount=buffer,
@@ -303,19 +478,13 @@ class AnalyticsService:
             )
         except Exception as e:
             logger.error(f"Error calculating safe to spend: {e}")
+            _skip_cache.set(True)
             # ... (error handling code remains the same) ...
             # Return safe default
             zero = Decimal("0.00")
-            empty_breakdown = FrozenFundsBreakdown(
-                unpaid_bills=zero,
-                projected_surety=zero,
-                unbilled_cc=zero,
-                active_goals=zero,
-                total_frozen=zero
-            )
             return SafeToSpendResponse(
                 current_balance=zero,
-                frozen_funds=empty_breakdown,
+                frozen_funds=_zero_burden(),
                 buffer_amount=zero,
                 buffer_percentage=0.0,
                 safe_to_spend=zero,
@@ -323,58 +492,64 @@ class AnalyticsService:
                 status="warning"
             )
 
-    async def debug_buffer_Calculation(self, db: AsyncSession, user_id: UUID):
-        """Debug method to show WHAT is being included in buffer calculation."""
+    async def debug_buffer_Calculation(self, db: AsyncSession, user_id: UUID, detailed: bool = False):
+        """Debug method to show WHAT is being included in buffer calculation.
+        Individual transactions are only fetched when `detailed` is True."""
         today_date = self._get_today()
         thirty_days_ago = today_date - timedelta(days=30)
         
-        # EXACT SAME logic as calculation
-        stmt = (
-            select(Transaction)
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.category.notin_(["Income", "Investment", "Housing", "Bill Payment", "Transfer", "EMI", "Loan", "Insurance", "Misc"]))
-            .where(Transaction.sub_category != "Credit Card Payment")
-            .where(Transaction.is_surety == False)
-            .where(func.abs(Transaction.amount) <= 5000)  # Exclude large one-off purchases > 5k
-            .where(Transaction.transaction_date >= thirty_days_ago)
-            .where(Transaction.transaction_date <= today_date)
-            .order_by(Transaction.amount) # Sort by amount (negative first = biggest spenders)
-        )
-        
-        result = await db.execute(stmt)
-        txns = result.scalars().all()
-        
-        total = sum(abs(t.amount) for t in txns)
+        # EXACT SAME filter as calculation
+        params = {
+            "user_id": user_id,
+            "discretionary_excluded": _DISCRETIONARY_EXCLUDED,
+            "window_start": thirty_days_ago,
+            "window_end": today_date
+        }
+        summary = (await db.execute(_DEBUG_BUFFER_SUMMARY_STMT, params)).one()
+        total = summary.total or Decimal("0")
         
-        return {
+        response = {
             "total_discretionary_30d": total,
             "daily_average": total / 30,
-            "count": len(txns),
-            "transactions": [
-                {
-                    "date": t.transaction_date,
-                    "amount": t.amount,
-                    "merchant": t.merchant_name,
-                    "category": t.category,
-                    "sub_category": t.sub_category
-                }
-                for t in txns
-            ]
+            "count": summary.count
         }
+        
+        if detailed:
+            # Only the columns the response needs, as plain row mappings (no ORM instances)
+            stmt = (
+                select(
+                    Transaction.transaction_date.label("date"),
+                    Transaction.amount,
+                    Transaction.merchant_name.label("merchant"),
+                    Transaction.category,
+                    Transaction.sub_category
+                )
+                .where(Transaction.user_id == bindparam("user_id"))
+                .where(_DISCRETIONARY_FILTER)
+                .order_by(Transaction.amount) # Sort by amount (negative first = biggest spenders)
+                .limit(DEBUG_BUFFER_MAX_ROWS)
+                .execution_options(yield_per=DEBUG_BUFFER_MAX_ROWS // 4)
+            )
+            # Stream through a server-side cursor so only one batch is buffered at a time
+            result = await db.stream(stmt, params)
+            response["transactions"] = [dict(row) async for row in result.mappings()]
+        
+        return response
 
+    @_versioned_cache("summary")
     async def get_monthly_summary(
         self,
         db: AsyncSession,
         user_id: UUID,
         month: Optional[int] = None,
         year: Optional[int] = None,
-        scope: str = "month"
+        scope: str = "month",
+        month_range: Optional[Dict[str, date]] = None
     ) -> MonthlySummaryResponse:
-        import datetime
-        
-        target_date = self._get_today()
-        if month and year:
-            target_date = date(year, month, 1)
+        if month_range is not None:
+            target_date = month_range["month_start"]
+        else:
+            target_date = self._resolve_target_date(month, year)
         
         # Determine date range based on scope
         if scope == "year":
@@ -389,62 +564,32 @@ class AnalyticsService:
             period_label = "All Time"
         else:
             # Default to month
-            date_range = get_month_date_range(target_date)
+            date_range = month_range or get_month_date_range(target_date)
             start_date = date_range["month_start"]
             end_date = date_range["month_end"]
             period_label = start_date.strftime("%B")
 
-        # Calculate Income
-        income_stmt = (
-            select(func.sum(Transaction.amount))
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.category == "Income")
-            .where(Transaction.transaction_date >= start_date)
-            .where(Transaction.transaction_date <= end_date)
-        )
+        # Income, expense, CC settlements and net balance in a single pass over the period
+        totals = (await db.execute(_PERIOD_TOTALS_STMT, {
+            "user_id": user_id,
+            "start_date": start_date,
+            "end_date": end_date
+        })).one()
         
-        expense_stmt = (
-            select(func.sum(Transaction.amount))
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.category.notin_(["Income"]))
-            .where(Transaction.transaction_date >= start_date)
-            .where(Transaction.transaction_date <= end_date)
-        )
-        
-        # Execute sequentially
-        income_result = await db.execute(income_stmt)
-        expense_result = await db.execute(expense_stmt)
-        
-        total_income = income_result.scalar() or Decimal("0")
-        total_expense_raw = abs(expense_result.scalar() or Decimal("0"))
+        total_income = totals.income or Decimal("0")
+        total_expense_raw = abs(totals.expense or Decimal("0"))
         
-        
-        # Calculate Prior Period Settlement (Strictly Credit Card Payments)
+        # Prior Period Settlement (Strictly Credit Card Payments)
         # We assume these payments are for previous month's dues.
-        prior_settlement_stmt = (
-            select(func.sum(Transaction.amount))
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.sub_category == "Credit Card Payment")
-            .where(Transaction.transaction_date >= start_date)
-            .where(Transaction.transaction_date <= end_date)
-        )
-        prior_res = await db.execute(prior_settlement_stmt)
-        prior_period_settlement = abs(prior_res.scalar() or Decimal("0"))
+        prior_period_settlement = abs(totals.cc_settlement or Decimal("0"))
         
         # Current Period Expense is Total Expense minus the settlements
         # (Assuming total_expense_raw includes the CC payments, which it does as they are not Income)
         current_period_expense = total_expense_raw - prior_period_settlement
         
-        balance_stmt = (
-            select(func.sum(Transaction.amount))
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.transaction_date >= start_date)
-            .where(Transaction.transaction_date <= end_date)
-        )
-        balance_res = await db.execute(balance_stmt)
-        net_balance = balance_res.scalar() or Decimal("0")
+        net_balance = totals.net_balance or Decimal("0")
         
-        return MonthlySummaryResponse(
+        return MonthlySummaryResponse.model_construct(
             total_income=total_income,
             total_expense=total_expense_raw,
             balance=net_balance,
@@ -453,3 +598,41 @@ class AnalyticsService:
             current_period_expense=current_period_expense,
             prior_period_settlement=prior_period_settlement
         )
+
+    async def get_dashboard(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        month: Optional[int] = None,
+        year: Optional[int] = None
+    ) -> AnalyticsDashboardResponse:
+        """Monthly summary, variance and safe-to-spend computed concurrently for one dashboard load."""
+        version_token = _request_version.set((user_id, await _version_token(db, user_id)))
+        today_token = _request_today.set(self._get_today())
+        try:
+            month_range = get_month_date_range(self._resolve_target_date(month, year))
+            
+            # Safe-to-spend (the most round-trips) overlaps the two single-query
+            # sections on one extra session: at most two connections per dashboard load
+            async def summary_and_variance():
+                summary = await self.get_monthly_summary(db, user_id, month_range=month_range)
+                variance = await self.get_variance_analysis(db, user_id, month_range=month_range)
+                return summary, variance
+            
+            (summary, variance), safe_to_spend = await asyncio.gather(
+                summary_and_variance(),
+                self._run_in_session(self.calculate_safe_to_spend_amount, user_id)
+            )
+        finally:
+            _request_today.reset(today_token)
+            _request_version.reset(version_token)
+        return AnalyticsDashboardResponse.model_construct(
+            summary=summary,
+            variance=variance,
+            safe_to_spend=safe_to_spend
+        )
+
+
+@lru_cache(maxsize=1)
+def get_analytics_service() -> AnalyticsService:
+    return AnalyticsService()
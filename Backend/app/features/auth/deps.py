@@ -1,8 +1,41 @@
+from typing import Optional
 from fastapi import Request, HTTPException, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
 from app.features.auth.models import User
 from app.core.database import get_db
+from app.utils.cache import TTLCache
+
+# Per-process snapshot of user rows keyed by email, so most requests skip the users lookup
+_user_cache = TTLCache(maxsize=10_000, ttl=30)
+_USER_COLUMNS = tuple(c.key for c in User.__table__.columns)
+
+
+def invalidate_user(email: str) -> None:
+    """Drop the cached snapshot after the user row changes."""
+    _user_cache.delete(email)
+
+
+async def _load_user(db: AsyncSession, email: str) -> Optional[User]:
+    snapshot = _user_cache.get(email)
+    if snapshot is not None:
+        # Re-attach a copy to this request's session without a SELECT,
+        # so handlers can still modify and commit it as usual.
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
+    if user is None and email != email.lower():
+        # Tokens issued before scripts/lowercase_emails.py lowercased the stored row
+        result = await db.execute(select(User).where(User.email == email.lower()))
+        user = result.scalar_one_or_none()
+    if user:
+        _user_cache.set(email, {key: getattr(user, key) for key in _USER_COLUMNS})
+    return user
+
 
 async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
     # 1. OPTIONAL: Check if user is already attached (e.g. by some other middleware)
@@ -16,9 +49,8 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
             detail="Authentication required"
         )
     
-    # 3. Fetch User from DB
-    result = await db.execute(select(User).where(User.email == request.state.user_email))
-    user = result.scalar_one_or_none()
+    # 3. Fetch User (cached snapshot or DB)
+    user = await _load_user(db, request.state.user_email)
     
     if not user:
          raise HTTPException(
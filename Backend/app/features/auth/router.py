@@ -5,9 +5,11 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import create_access_token, get_password_hash, verify_password, needs_rehash
 from app.features.auth.models import User
 from app.features.auth import schemas
+from app.features.auth.deps import invalidate_user
+from app.features.notifications.service import get_notification_service
 from app.core.config import get_settings
 
 import logging
@@ -21,9 +23,9 @@ async def register_user(
     db: Annotated[AsyncSession, Depends(get_db)],
     background_tasks: BackgroundTasks
 ):
-    # Check if user exists
+    # Check if user exists (user_in.email is already normalized)
     result = await db.execute(select(User).where(User.email == user_in.email))
-    existing_user = result.scalar_one_or_none()
+    existing_user = result.scalars().first()
     
     import random
     import string
@@ -46,6 +48,7 @@ async def register_user(
             existing_user.verification_code_expires_at = otp_expiry
             db.add(existing_user)
             await db.commit()
+            invalidate_user(existing_user.email)
             
             # Send Email (Background task to avoid blocking)
             background_tasks.add_task(send_otp_email, user_in.email, otp)
@@ -75,7 +78,7 @@ async def verify_otp(
     from datetime import datetime, timezone
     
     result = await db.execute(select(User).where(User.email == verification_data.email))
-    user = result.scalar_one_or_none()
+    user = result.scalars().first()
     
     if not user:
         raise HTTPException(status_code=400, detail="User not found")
@@ -98,6 +101,7 @@ async def verify_otp(
         user.verification_code_expires_at = None
         db.add(user)
         await db.commit()
+        invalidate_user(user.email)
         
     # Create Token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -111,8 +115,9 @@ async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
-    result = await db.execute(select(User).where(User.email == form_data.username))
-    user = result.scalar_one_or_none()
+    email = schemas.normalize_email(form_data.username)
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
     
     if not user or not verify_password(form_data.password, user.hashed_password):
         logger.warning(f"Login failed for user: {form_data.username}")
@@ -125,6 +130,12 @@ async def login_for_access_token(
     if not user.is_active:
         raise HTTPException(status_code=400, detail="User not verified. Please verify your email.")
 
+    # Upgrade bcrypt / weaker argon2 hashes now that we have the plaintext
+    if needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(form_data.password)
+        await db.commit()
+        invalidate_user(user.email)
+
     logger.info(f"User logged in successfully: {user.email}")
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -142,3 +153,12 @@ async def verify_user_password(
     if not verify_password(data.password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid password")
     return {"valid": True}
+
+@router.put("/fcm-token")
+async def update_fcm_token(
+    data: schemas.FCMTokenUpdate,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)]
+):
+    updated = await get_notification_service().update_fcm_token(db, current_user, data.token)
+    return {"updated": updated}
@@ -1,7 +1,12 @@
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator, ConfigDict
 import uuid
 
+
+def normalize_email(email: str) -> str:
+    """Emails are stored lowercased; scripts/lowercase_emails.py normalizes older rows."""
+    return email.strip().lower()
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -13,14 +18,18 @@ class UserBase(BaseModel):
     email: EmailStr
     is_active: Optional[bool] = True
 
+    @field_validator("email")
+    @classmethod
+    def _normalize_email(cls, v: str) -> str:
+        return normalize_email(v)
+
 class UserCreate(UserBase):
     password: str
 
 class UserResponse(UserBase):
     id: uuid.UUID
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class PasswordVerification(BaseModel):
     password: str
@@ -28,3 +37,11 @@ class PasswordVerification(BaseModel):
 class VerifyOTP(BaseModel):
     email: EmailStr
     otp: str
+
+    @field_validator("email")
+    @classmethod
+    def _normalize_email(cls, v: str) -> str:
+        return normalize_email(v)
+
+class FCMTokenUpdate(BaseModel):
+    token: str
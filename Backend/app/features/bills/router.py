@@ -13,7 +13,7 @@ from app.features.bills.schemas import (
     MarkPaidRequest,
     UpcomingBillsResponse
 )
-from app.features.bills.service import BillService
+from app.features.bills.service import BillService, get_bill_service
 
 router = APIRouter()
 
@@ -23,7 +23,7 @@ async def create_bill(
     bill_data: BillCreate,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[BillService, Depends()]
+    service: Annotated[BillService, Depends(get_bill_service)]
 ):
     """Create a new bill (one-time or recurring)."""
     bill = await service.create_bill(db, current_user.id, bill_data)
@@ -34,7 +34,7 @@ async def create_bill(
 async def list_bills(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[BillService, Depends()],
+    service: Annotated[BillService, Depends(get_bill_service)],
     paid: Optional[bool] = Query(None, description="Filter by paid status")
 ):
     """List all bills for the current user."""
@@ -46,7 +46,7 @@ async def list_bills(
 async def get_upcoming_bills(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[BillService, Depends()],
+    service: Annotated[BillService, Depends(get_bill_service)],
     days: int = Query(30, ge=1, le=90, description="Number of days to look ahead")
 ):
     """Get unpaid bills due in the next X days."""
@@ -66,7 +66,7 @@ async def get_bill(
     bill_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[BillService, Depends()]
+    service: Annotated[BillService, Depends(get_bill_service)]
 ):
     """Get details of a specific bill."""
     bill = await service.get_bill_by_id(db, bill_id, current_user.id)
@@ -86,7 +86,7 @@ async def update_bill(
     bill_data: BillUpdate,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[BillService, Depends()]
+    service: Annotated[BillService, Depends(get_bill_service)]
 ):
     """Update a bill."""
     bill = await service.update_bill(db, bill_id, current_user.id, bill_data)
@@ -106,7 +106,7 @@ async def mark_bill_paid(
     request: MarkPaidRequest,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[BillService, Depends()]
+    service: Annotated[BillService, Depends(get_bill_service)]
 ):
     """Mark a bill as paid or unpaid."""
     bill = await service.mark_paid(db, bill_id, current_user.id, request.paid)
@@ -4,12 +4,14 @@ from datetime import date, datetime, timedelta
 import zoneinfo
 from decimal import Decimal
 from typing import List, Optional
+from functools import lru_cache
 from calendar import monthrange
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from app.core.config import get_settings
 from app.features.bills.models import Bill
 from app.features.bills.schemas import BillCreate, BillUpdate
+from app.features.analytics.cache import invalidate_analytics_cache
 
 settings = get_settings()
 # Constants
@@ -41,6 +43,7 @@ class BillService:
         db.add(bill)
         await db.commit()
         await db.refresh(bill)
+        invalidate_analytics_cache(user_id)
         logger.info(f"Created bill '{bill.title}' for user {user_id}")
         return bill
     
@@ -94,6 +97,7 @@ class BillService:
         
         await db.commit()
         await db.refresh(bill)
+        invalidate_analytics_cache(user_id)
         logger.info(f"Updated bill {bill_id}")
         return bill
     
@@ -113,6 +117,7 @@ class BillService:
         bill.is_paid = paid
         await db.commit()
         await db.refresh(bill)
+        invalidate_analytics_cache(user_id)
         logger.info(f"Marked bill {bill_id} as {'paid' if paid else 'unpaid'}")
         return bill
     
@@ -238,3 +243,8 @@ class BillService:
             next_month,
             min(recurrence_day, monthrange(next_year, next_month)[1])
         )
+
+
+@lru_cache(maxsize=1)
+def get_bill_service() -> BillService:
+    return BillService()
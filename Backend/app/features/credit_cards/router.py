@@ -11,7 +11,7 @@ from app.features.credit_cards.schemas import (
     CreditCardResponse,
     CreditCardCycleInfo
 )
-from app.features.credit_cards.service import CreditCardService
+from app.features.credit_cards.service import CreditCardService, get_credit_card_service
 
 router = APIRouter()
 
@@ -21,7 +21,7 @@ async def create_credit_card(
     card_data: CreditCardCreate,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[CreditCardService, Depends()]
+    service: Annotated[CreditCardService, Depends(get_credit_card_service)]
 ):
     """Create a new credit card with billing cycle information."""
     card = await service.create_card(db, current_user.id, card_data)
@@ -32,7 +32,7 @@ async def create_credit_card(
 async def list_credit_cards(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[CreditCardService, Depends()],
+    service: Annotated[CreditCardService, Depends(get_credit_card_service)],
     active_only: bool = True
 ):
     """List all credit cards for the current user."""
@@ -45,7 +45,7 @@ async def get_credit_card(
     card_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[CreditCardService, Depends()]
+    service: Annotated[CreditCardService, Depends(get_credit_card_service)]
 ):
     """Get details of a specific credit card."""
     card = await service.get_card_by_id(db, card_id, current_user.id)
@@ -65,7 +65,7 @@ async def update_credit_card(
     card_data: CreditCardUpdate,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[CreditCardService, Depends()]
+    service: Annotated[CreditCardService, Depends(get_credit_card_service)]
 ):
     """Update a credit card."""
     card = await service.update_card(db, card_id, current_user.id, card_data)
@@ -84,7 +84,7 @@ async def deactivate_credit_card(
     card_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[CreditCardService, Depends()]
+    service: Annotated[CreditCardService, Depends(get_credit_card_service)]
 ):
     """Deactivate a credit card (soft delete)."""
     success = await service.deactivate_card(db, card_id, current_user.id)
@@ -101,7 +101,7 @@ async def get_billing_cycle_info(
     card_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[CreditCardService, Depends()]
+    service: Annotated[CreditCardService, Depends(get_credit_card_service)]
 ):
     """Get current billing cycle information for a credit card."""
     cycle_info = await service.get_cycle_info(db, card_id, current_user.id)
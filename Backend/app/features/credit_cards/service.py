@@ -3,11 +3,13 @@ from uuid import UUID
 from datetime import date
 from decimal import Decimal
 from typing import List, Optional
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from app.features.credit_cards.models import CreditCard
 from app.features.credit_cards.schemas import CreditCardCreate, CreditCardUpdate, CreditCardCycleInfo
 from app.features.transactions.models import Transaction
+from app.features.analytics.cache import invalidate_analytics_cache
 from app.utils.finance_utils import get_billing_cycle_dates
 
 logger = logging.getLogger(__name__)
@@ -29,6 +31,7 @@ class CreditCardService:
         db.add(card)
         await db.commit()
         await db.refresh(card)
+        invalidate_analytics_cache(user_id)
         logger.info(f"Created credit card {card.card_name} for user {user_id}")
         return card
     
@@ -80,6 +83,7 @@ class CreditCardService:
         
         await db.commit()
         await db.refresh(card)
+        invalidate_analytics_cache(user_id)
         logger.info(f"Updated credit card {card_id}")
         return card
     
@@ -97,6 +101,7 @@ class CreditCardService:
         
         card.is_active = False
         await db.commit()
+        invalidate_analytics_cache(user_id)
         logger.info(f"Deactivated credit card {card_id}")
         return True
     
@@ -181,3 +186,8 @@ class CreditCardService:
             total_unbilled += unbilled
         
         return total_unbilled
+
+
+@lru_cache(maxsize=1)
+def get_credit_card_service() -> CreditCardService:
+    return CreditCardService()
@@ -7,7 +7,7 @@ from app.core.database import get_db
 from app.features.auth.deps import get_current_user
 from app.features.auth.models import User
 from app.features.goals.schemas import GoalCreate, GoalResponse, FeasibilityCheck
-from app.features.goals.service import GoalService
+from app.features.goals.service import GoalService, get_goal_service
 
 router = APIRouter()
 
@@ -16,7 +16,7 @@ async def check_goal_feasibility(
     goal_data: GoalCreate,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[GoalService, Depends()]
+    service: Annotated[GoalService, Depends(get_goal_service)]
 ):
     return await service.check_feasibility(db, current_user.id, goal_data)
 
@@ -25,7 +25,7 @@ async def create_goal(
     goal_data: GoalCreate,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[GoalService, Depends()]
+    service: Annotated[GoalService, Depends(get_goal_service)]
 ):
     return await service.create_goal(db, current_user.id, goal_data)
 
@@ -33,7 +33,7 @@ async def create_goal(
 async def get_my_goals(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[GoalService, Depends()]
+    service: Annotated[GoalService, Depends(get_goal_service)]
 ):
     return await service.get_active_goals(db, current_user.id)
 
@@ -42,6 +42,6 @@ async def delete_goal(
     goal_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    service: Annotated[GoalService, Depends()]
+    service: Annotated[GoalService, Depends(get_goal_service)]
 ):
     await service.delete_goal(db, current_user.id, goal_id)
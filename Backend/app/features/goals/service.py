@@ -2,18 +2,20 @@ import logging
 from uuid import UUID
 from datetime import date
 from typing import List, Optional
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 
 from app.features.goals.models import Goal
 from app.features.goals.schemas import GoalCreate, FeasibilityCheck
-from app.features.analytics.service import AnalyticsService
+from app.features.analytics.service import get_analytics_service
+from app.features.analytics.cache import invalidate_analytics_cache
 
 logger = logging.getLogger(__name__)
 
 class GoalService:
     def __init__(self):
-        self.analytics_service = AnalyticsService()
+        self.analytics_service = get_analytics_service()
 
     def _calculate_monthly_contribution(self, target_amount: float, target_date: date) -> float:
         today = date.today()
@@ -91,6 +93,7 @@ class GoalService:
         db.add(goal)
         await db.commit()
         await db.refresh(goal)
+        invalidate_analytics_cache(user_id)
         return goal
 
     async def get_active_goals(self, db: AsyncSession, user_id: UUID) -> List[Goal]:
@@ -116,3 +119,9 @@ class GoalService:
         if goal:
             await db.delete(goal)
             await db.commit()
+            invalidate_analytics_cache(user_id)
+
+
+@lru_cache(maxsize=1)
+def get_goal_service() -> GoalService:
+    return GoalService()
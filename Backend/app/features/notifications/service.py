@@ -0,0 +1,44 @@
+import logging
+from functools import lru_cache
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.features.auth.models import User
+from app.features.auth.deps import invalidate_user
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Last stored FCM token by user id, so re-registering a known token skips the DB
+_token_cache = TTLCache(maxsize=10_000, ttl=86_400)
+
+
+class NotificationService:
+
+    async def update_fcm_token(self, db: AsyncSession, user: User, token: str) -> bool:
+        """Store a device token; returns False when it was already current."""
+        # Clients re-register on every launch; a token we already know skips the DB
+        if _token_cache.get(user.id) == token:
+            return False
+
+        # The IS DISTINCT FROM guard makes an unchanged token a no-op, so Postgres
+        # takes no row lock and writes no WAL; RETURNING tells us which case it was.
+        stmt = (
+            update(User)
+            .where(User.id == user.id)
+            .where(User.fcm_token.is_distinct_from(token))
+            .values(fcm_token=token)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        updated = result.scalar_one_or_none() is not None
+        if updated:
+            await db.commit()
+            invalidate_user(user.email)
+        _token_cache.set(user.id, token)
+        return updated
+
+
+@lru_cache(maxsize=1)
+def get_notification_service() -> NotificationService:
+    return NotificationService()
@@ -7,7 +7,7 @@ from google_auth_oauthlib.flow import Flow
 
 from app.core.database import get_db
 from app.core.config import get_settings
-from app.features.auth.deps import get_current_user
+from app.features.auth.deps import get_current_user, invalidate_user
 from app.features.auth.models import User
 from app.features.sync.service import SyncService
 from app.features.sync.models import SyncLog
@@ -101,6 +101,7 @@ async def google_callback(
         }
         
         await db.commit()
+        invalidate_user(current_user.email)
         logger.info(f"Committed Gmail credentials for {current_user.email}")
         
         return {"status": "success"}
@@ -196,6 +197,7 @@ async def disconnect_gmail(
     
     current_user.gmail_credentials = None
     await db.commit()
+    invalidate_user(current_user.email)
     
     logger.info(f"User {current_user.email} disconnected Gmail")
     return {"status": "disconnected"}
@@ -21,6 +21,7 @@ from app.features.sanitizer.service import get_sanitizer_service
 from app.features.transactions.models import TransactionStatus
 from app.features.sync.models import SyncLog
 from app.features.auth.models import User
+from app.features.auth.deps import invalidate_user
 from app.features.categories.service import CategoryService
 
 settings = get_settings()
@@ -174,6 +175,7 @@ class SyncService:
                     "expiry": creds.expiry.isoformat() if creds.expiry else None
                 }
                 await self.db.commit()
+                invalidate_user(user.email)
 
             service = build('gmail', 'v1', credentials=creds)
             query = "spent OR debited OR transaction OR alert OR paid"
@@ -240,6 +242,8 @@ class SyncService:
                      cat_list.append(c.name)
             
             processed_count = 0
+            # Wealth-mapped transactions, applied per holding after the loop
+            matched_by_holding = {}
             for msg in messages:
                 dedup_payload = f"{msg['id']}:{msg['internalDate']}"
                 content_hash = hashlib.sha256(dedup_payload.encode()).hexdigest()
@@ -305,12 +309,21 @@ class SyncService:
                 
                 # Attempt to map to Wealth/Investment
                 try:
-                    await self.wealth_service.process_transaction_match(new_txn)
+                    holding_id = await self.wealth_service.match_transaction_holding(new_txn)
+                    if holding_id is not None:
+                        matched_by_holding.setdefault(holding_id, []).append(new_txn)
                 except Exception as w_ex:
                     logger.error(f"Wealth mapping failed for txn {new_txn.id}: {w_ex}")
 
                 processed_count += 1
             
+            # One snapshot load, recalculation and commit per holding, not per transaction
+            for holding_id, txns in matched_by_holding.items():
+                try:
+                    await self.wealth_service.add_transactions_to_holding(txns, holding_id)
+                except Exception as w_ex:
+                    logger.error(f"Wealth update failed for holding {holding_id}: {w_ex}")
+            
             await self._log_end(log, "SUCCESS", processed_count)
             
         except Exception as e:
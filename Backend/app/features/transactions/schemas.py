@@ -2,7 +2,7 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, date
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Literal
 
 # Core status constants for validation
@@ -63,8 +63,7 @@ class TransactionResponse(TransactionBase):
     category_color: Optional[str] = None
     sub_category_color: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class VerificationRequest(BaseModel):
     category: str
@@ -11,6 +11,7 @@ from app.features.transactions import schemas
 from app.features.categories.models import SubCategory
 from app.features.transactions.models import TransactionStatus
 from app.core.database import get_db
+from app.features.analytics.cache import invalidate_analytics_cache
 import logging
 logger = logging.getLogger(__name__)
 
@@ -177,6 +178,7 @@ class TransactionService:
 
         await self.db.commit()
         await self.db.refresh(txn)
+        invalidate_analytics_cache(user_id)
         return txn
 
     async def get_merchant_mapping(self, raw_merchant: str) -> Optional[MerchantMapping]:
@@ -193,6 +195,7 @@ class TransactionService:
         txn = Transaction(**txn_data)
         self.db.add(txn)
         await self.db.commit()
+        invalidate_analytics_cache(txn.user_id)
         return txn
 
     async def create_manual_transaction(self, user_id: UUID, data: schemas.ManualTransactionCreate) -> Transaction:
@@ -259,6 +262,7 @@ class TransactionService:
                 txn.is_surety = await self._resolve_surety(txn.sub_category)
             
         await self.db.commit()
+        invalidate_analytics_cache(user_id)
         await self.db.refresh(txn)
         txns = await self._attach_icons([txn])
         return txns[0]
@@ -281,6 +285,7 @@ class TransactionService:
             
         txn.is_settled = not txn.is_settled
         await self.db.commit()
+        invalidate_analytics_cache(user_id)
         await self.db.refresh(txn)
         
         txns = await self._attach_icons([txn])
@@ -296,3 +301,4 @@ class TransactionService:
             
         await self.db.delete(txn)
         await self.db.commit()
+        invalidate_analytics_cache(user_id)
@@ -0,0 +1,48 @@
+from uuid import UUID
+from app.utils.cache import TTLCache
+
+# MFAPI search results keyed by normalized query. Typeahead traffic is dominated
+# by a handful of AMC prefixes ("hdfc", "sbi", ...), and the scheme list changes rarely.
+mf_search_cache = TTLCache(maxsize=2048, ttl=3600)
+MF_SEARCH_KEY_MAX_LEN = 64
+
+# Asset prices keyed by (api_source, ticker, target_date), with None meaning latest.
+# Shared across users, since most of them hold the same handful of funds. Past-dated
+# prices never change, so they live far longer than today's.
+price_cache = TTLCache(maxsize=8192, ttl=60)
+HISTORICAL_PRICE_TTL_SECONDS = 7 * 86_400
+# MF NAVs are published once a day, so today's NAV outlives a stock quote
+LATEST_NAV_TTL_SECONDS = 900
+
+# Full MFAPI scheme histories (every NAV since launch, as parsed arrays) keyed by
+# scheme code, so pricing one scheme on many dates costs one HTTP call. Also serves
+# the SIP date analysis and the simulator. Kept short because it carries today's NAV.
+mfapi_scheme_cache = TTLCache(maxsize=512, ttl=900)
+
+# yfinance Ticker objects keyed by symbol, reused across price lookups
+yf_ticker_cache = TTLCache(maxsize=1024, ttl=86_400)
+
+# Forecasts keyed by (user_id, years)
+forecast_cache = TTLCache(maxsize=1024, ttl=600)
+
+# Fitted Prophet models keyed by user_id, stored with the history they were fit on.
+# A model is reused, for any horizon, only while that history is unchanged.
+prophet_model_cache = TTLCache(maxsize=256, ttl=3600)
+
+
+def mf_search_key(query: str) -> str:
+    return query.strip().lower()[:MF_SEARCH_KEY_MAX_LEN]
+
+
+# Compiled investment mapping rules keyed by user_id; dropped when a rule is created
+rule_matcher_cache = TTLCache(maxsize=4096, ttl=3600)
+
+
+# Serialized /holdings responses keyed by user_id; dropped on any holding write
+holdings_cache = TTLCache(maxsize=4096, ttl=300)
+
+
+def invalidate_wealth_cache(user_id: UUID) -> None:
+    """Drop a user's cached holdings and forecasts after their portfolio changes."""
+    holdings_cache.delete(user_id)
+    forecast_cache.invalidate(lambda key: key[0] == user_id)
@@ -0,0 +1,82 @@
+"""
+Prophet fitting, run in worker processes.
+
+Kept apart from the service so a spawned worker imports only pandas and
+Prophet, not the app's config, database engine and routers.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    from prophet import Prophet
+    from prophet.serialize import model_to_json, model_from_json
+except ImportError:
+    Prophet = None
+
+# Fits are CPU-bound and hold the GIL in Prophet's Python wrapper, so they get
+# their own processes; two keeps a burst of forecasts from starving the API host
+PROPHET_WORKERS = 2
+
+_prophet_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_prophet_pool() -> ProcessPoolExecutor:
+    global _prophet_pool
+    if _prophet_pool is None:
+        # spawn, not fork: the API process runs threads and holds DB connections
+        _prophet_pool = ProcessPoolExecutor(
+            max_workers=PROPHET_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _prophet_pool
+
+
+def shutdown_prophet_pool() -> None:
+    global _prophet_pool
+    if _prophet_pool is not None:
+        _prophet_pool.shutdown(wait=False, cancel_futures=True)
+        _prophet_pool = None
+
+
+ForecastRow = Tuple[date, float, float, float]
+
+
+def run_prophet(
+    history: Sequence[Tuple[date, float]],
+    years: int,
+    model_json: Optional[str] = None
+) -> Tuple[str, List[ForecastRow]]:
+    """
+    Fit Prophet on (date, value) history, unless a serialized model fit on the
+    same history is passed in, and predict `years` ahead.
+
+    Returns the model as JSON for the caller to cache, plus the first-of-month
+    future points as (date, yhat, yhat_lower, yhat_upper). Both cross the
+    process boundary, so they are kept small and plainly picklable.
+    """
+    df = pd.DataFrame.from_records(history, columns=['ds', 'y'])
+    if model_json is None:
+        m = Prophet(daily_seasonality=False, yearly_seasonality=True)
+        m.fit(df)
+        model_json = model_to_json(m)
+    else:
+        m = model_from_json(model_json)
+
+    future = m.make_future_dataframe(periods=years * 365)
+    forecast = m.predict(future)
+
+    # Strictly future points, sampled monthly
+    last_date = pd.to_datetime(df['ds'].max())
+    future_forecast = forecast[forecast['ds'] > last_date]
+    monthly = future_forecast[future_forecast['ds'].dt.day == 1]
+    points = list(zip(
+        monthly['ds'].dt.date,
+        monthly['yhat'].tolist(),
+        monthly['yhat_lower'].tolist(),
+        monthly['yhat_upper'].tolist()
+    ))
+    return model_json, points
@@ -3,7 +3,7 @@ from enum import Enum
 import uuid
 from typing import Optional
 from datetime import datetime, date
-from sqlalchemy import String, Float, DateTime, ForeignKey, Integer, Date, Boolean, JSON
+from sqlalchemy import String, Float, DateTime, ForeignKey, Integer, Date, Boolean, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -22,6 +22,10 @@ class AssetType(str, Enum):
 
 class InvestmentHolding(Base):
     __tablename__ = "investment_holdings"
+    __table_args__ = (
+        # Per-user holdings list and asset-type allocation rollups
+        Index("ix_holdings_user_type", "user_id", "asset_type"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), index=True)
@@ -45,11 +49,25 @@ class InvestmentHolding(Base):
 
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     
-    snapshots: Mapped[list["InvestmentSnapshot"]] = relationship("InvestmentSnapshot", back_populates="holding", cascade="all, delete-orphan")
+    snapshots: Mapped[list["InvestmentSnapshot"]] = relationship(
+        "InvestmentSnapshot",
+        back_populates="holding",
+        cascade="all, delete-orphan",
+        order_by="InvestmentSnapshot.captured_at"  # Chronological, as the SIP analysis expects
+    )
     mapping_rules: Mapped[list["InvestmentMappingRule"]] = relationship("InvestmentMappingRule", back_populates="holding", cascade="all, delete-orphan")
 
 class InvestmentSnapshot(Base):
     __tablename__ = "investment_snapshots"
+    __table_args__ = (
+        # Per-holding history in date order (scanned backwards for "latest"), values from the index
+        Index(
+            "ix_snapshots_holding_captured",
+            "holding_id",
+            "captured_at",
+            postgresql_include=["total_value", "units_held"]
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     holding_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("investment_holdings.id"), index=True)
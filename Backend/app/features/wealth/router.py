@@ -1,16 +1,19 @@
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import logging
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal
 from app.features.auth.deps import get_current_user
 from app.features.wealth import schemas
 from app.features.wealth.service import WealthService
 from app.features.wealth.models import InvestmentHolding
 from app.features.auth.models import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["Wealth"])
 
 @router.get("/holdings", response_model=List[schemas.InvestmentHoldingOut])
@@ -18,7 +21,7 @@ async def get_holdings(
     current_user: User = Depends(get_current_user),
     service: WealthService = Depends()
 ):
-    return await service.get_holdings(current_user.id)
+    return Response(content=await service.get_holdings_json(current_user.id), media_type="application/json")
 
 @router.get("/holdings/{holding_id}", response_model=schemas.InvestmentHoldingDetail)
 async def get_holding_details(
@@ -64,16 +67,21 @@ async def map_transaction(
 @router.get("/sync-prices")
 async def trigger_price_sync(
     background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    service: WealthService = Depends()
+    current_user: User = Depends(get_current_user)
 ):
     # Retrieve all holdings for user and refresh their prices
     # We can do this in background
+    user_id = current_user.id
+
     async def _sync_job():
-        # TODO: Implement bulk sync in service
-        pass 
+        # The request's session is closed by the time background tasks run
+        async with AsyncSessionLocal() as db:
+            try:
+                await WealthService(db).sync_user_prices(user_id)
+            except Exception as e:
+                logger.error(f"Price sync for user {user_id} failed: {e}", exc_info=True)
     
-    # Placeholder for now
+    background_tasks.add_task(_sync_job)
     return {"message": "Sync triggered"}
 
 @router.post("/import-cams", response_model=schemas.CAMSImportResponse)
@@ -1,33 +1,33 @@
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Literal, Optional, List
 from datetime import date, datetime
 from uuid import UUID
-from enum import Enum
-
-class AssetType(str, Enum):
-    SIP = "SIP"
-    MUTUAL_FUND = "MUTUAL_FUND"
-    STOCK = "STOCK"
-    FD = "FD"
-    RD = "RD"
-    PF = "PF"
-    GRATUITY = "GRATUITY"
-    GOLD = "GOLD"
-    REAL_ESTATE = "REAL_ESTATE"
-    OTHER = "OTHER"
+
+# Mirrors models.AssetType, which stays the type at the DB boundary. A Literal
+# is matched inside pydantic-core and serializes as the plain string, with no
+# Enum construction per row.
+AssetType = Literal[
+    "SIP",
+    "MUTUAL_FUND",
+    "STOCK",
+    "FD",
+    "RD",
+    "PF",
+    "GRATUITY",
+    "GOLD",
+    "REAL_ESTATE",
+    "OTHER",
+]
 
 class InvestmentHoldingBase(BaseModel):
+    # Numeric MF scheme codes (e.g. 120503) become strings inside pydantic-core,
+    # without a Python validator call per row
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
     name: str
     asset_type: AssetType
     ticker_symbol: Optional[str] = None
-    
-    @field_validator('ticker_symbol', mode='before')
-    @classmethod
-    def convert_to_string(cls, v):
-        if v is None:
-            return None
-        return str(v)
     api_source: Optional[str] = None
     interest_rate: Optional[float] = None
     maturity_date: Optional[date] = None
@@ -51,8 +51,10 @@ class InvestmentHoldingOut(InvestmentHoldingBase):
     last_updated_at: Optional[datetime] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Built once: validates ORM rows and serializes the whole list in one pass
+HoldingsListAdapter = TypeAdapter(List[InvestmentHoldingOut])
 
 class InvestmentSnapshotBase(BaseModel):
     captured_at: date
@@ -66,8 +68,7 @@ class InvestmentSnapshotOut(InvestmentSnapshotBase):
     holding_id: UUID
     is_projected: bool = False
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class InvestmentMappingRuleCreate(BaseModel):
     holding_id: UUID
@@ -78,8 +79,7 @@ class InvestmentMappingRuleOut(InvestmentMappingRuleCreate):
     id: UUID
     user_id: UUID
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class WealthDashboardSummary(BaseModel):
     total_wealth: float
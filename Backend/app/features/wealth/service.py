@@ -1,29 +1,47 @@
 
+import asyncio
+import bisect
 import uuid
 import logging
-from typing import List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional
 from datetime import date, datetime, timedelta
 import math
+import calendar
+import re
+from collections import Counter
 import httpx
 import pandas as pd
 import numpy as np
 from scipy import optimize
+from dateutil.relativedelta import relativedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func, and_
+from sqlalchemy import select, insert, update, desc, func, and_, cast, case, text, Date
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, Depends
 
 from app.core.database import get_db
 from app.features.wealth.models import InvestmentHolding, InvestmentSnapshot, InvestmentMappingRule, AssetType
 from app.features.wealth import schemas
+from app.features.wealth.cache import (
+    mf_search_cache,
+    mf_search_key,
+    price_cache,
+    HISTORICAL_PRICE_TTL_SECONDS,
+    LATEST_NAV_TTL_SECONDS,
+    mfapi_scheme_cache,
+    yf_ticker_cache,
+    rule_matcher_cache,
+    forecast_cache,
+    prophet_model_cache,
+    holdings_cache,
+    invalidate_wealth_cache
+)
+from app.features.wealth.forecasting import Prophet, get_prophet_pool, run_prophet
 from app.features.transactions.models import Transaction
 
 logger = logging.getLogger(__name__)
 
-# Try importing Prophet, handle if missing (though it should be there)
-try:
-    from prophet import Prophet
-except ImportError:
-    Prophet = None
+if Prophet is None:
     logger.warning("Facebook Prophet not installed. Forecasting will be disabled.")
 
 try:
@@ -32,6 +50,224 @@ except ImportError:
     yf = None
     logger.warning("yfinance not installed. Stock data will be unavailable.")
 
+# Valued by formula rather than a market quote
+_FIXED_INCOME_TYPES = (AssetType.FD, AssetType.RD, AssetType.PF, AssetType.GRATUITY)
+
+# Substrings of a lowercased CAMS transaction type that mark it a buy or a sell
+CAMS_BUY_KEYWORDS = ('purchase', 'sip', 'switch in', 'dividend', 'invest', 'reinvest')
+CAMS_SELL_KEYWORDS = ('redemption', 'sell', 'switch out', 'withdraw')
+
+# Weekly points the forecast needs before Prophet is worth fitting
+MIN_FORECAST_WEEKS = 5
+
+# Concurrent MFAPI/Yahoo requests during a price sync; keeps us under their rate limits
+PRICE_FETCH_CONCURRENCY = 10
+
+# Yahoo sometimes has no bar for the exact day (weekends, holidays); look this far ahead
+YF_PRICE_WINDOW_DAYS = 4
+
+# One pooled client for all MFAPI calls, so NAV lookups reuse keep-alive
+# connections instead of paying a TCP+TLS handshake each. Closed on app shutdown.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=10.0
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# In-flight MFAPI scheme downloads by scheme code, for request coalescing
+_mfapi_downloads: Dict[str, "asyncio.Future[NavSeries]"] = {}
+
+
+async def _download_mfapi_scheme(scheme_code: str) -> "NavSeries":
+    url = f"https://api.mfapi.in/mf/{scheme_code}"
+    resp = await get_http_client().get(url)
+    if resp.status_code != 200:
+        raise ValueError(f"Invalid MFAPI code: {scheme_code}")
+    data = resp.json().get("data", [])
+
+    # Data is list of {date: "dd-mm-yyyy", nav: "str"} sorted desc
+    ordinals, navs = [], []
+    for entry in data:
+        try:
+            day, month, year = entry["date"].split("-")
+            nav = float(entry["nav"])
+        except (KeyError, ValueError):
+            continue # Skip malformed rows rather than the whole scheme
+        ordinals.append(date(int(year), int(month), int(day)).toordinal())
+        navs.append(nav)
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    navs = np.asarray(navs, dtype=np.float64)
+    order = np.argsort(ordinals, kind="stable")
+    series = NavSeries(ordinals[order], navs[order])
+    mfapi_scheme_cache.set(scheme_code, series)
+    return series
+
+
+def _get_yf_ticker(symbol: str) -> "yf.Ticker":
+    ticker = yf_ticker_cache.get(symbol)
+    if ticker is None:
+        ticker = yf.Ticker(symbol)
+        yf_ticker_cache.set(symbol, ticker)
+    return ticker
+
+
+def _price_ttl(api_source: str, target_date: Optional[date]) -> Optional[float]:
+    """How long a fetched price stays in price_cache; None means the cache default."""
+    if target_date is not None and target_date < date.today():
+        return HISTORICAL_PRICE_TTL_SECONDS
+    if api_source == "MFAPI":
+        return LATEST_NAV_TTL_SECONDS
+    return None
+
+
+def _download_yf_closes(tickers: List[str], target_date: date) -> Dict[str, float]:
+    """
+    First close on or after `target_date` for many tickers, in one batched
+    yf.download call. Blocking. Tickers with no bar in the window are left out.
+    """
+    frame = yf.download(
+        tickers,
+        start=target_date,
+        end=target_date + timedelta(days=YF_PRICE_WINDOW_DAYS),
+        group_by="ticker",
+        threads=True,
+        progress=False
+    )
+    if frame.empty:
+        return {}
+    if isinstance(frame.columns, pd.MultiIndex):
+        closes = frame.xs("Close", axis=1, level=1)
+    else:
+        # Older yfinance flattens the columns for a single ticker
+        closes = frame[["Close"]].set_axis(tickers, axis=1)
+    first = closes.bfill().iloc[0]
+    return {ticker: float(price) for ticker, price in first.items() if pd.notna(price)}
+
+
+class NavSeries(NamedTuple):
+    """A scheme's NAV history as parallel arrays, oldest first: int64 date ordinals and float64 NAVs."""
+    ordinals: np.ndarray
+    navs: np.ndarray
+
+    def date_at(self, idx: int) -> date:
+        return date.fromordinal(int(self.ordinals[idx]))
+
+    def index_on_or_before(self, target: date) -> Optional[int]:
+        """Index of the last NAV dated <= target."""
+        idx = int(np.searchsorted(self.ordinals, target.toordinal(), side="right"))
+        return idx - 1 if idx else None
+
+    def index_closest_to(self, target: date, window: int) -> Optional[int]:
+        """Index of the NAV nearest target within +/- window days; on a tie, the earlier one."""
+        target_ord = target.toordinal()
+        idx = int(np.searchsorted(self.ordinals, target_ord))
+        best = None
+        if idx > 0 and target_ord - self.ordinals[idx - 1] <= window:
+            best = idx - 1
+        if idx < len(self.ordinals) and self.ordinals[idx] - target_ord <= window:
+            if best is None or self.ordinals[idx] - target_ord < target_ord - self.ordinals[best]:
+                best = idx
+        return best
+
+
+class _RuleMatcher(NamedTuple):
+    """A user's mapping rules, compiled once: EXACT patterns in a dict, CONTAINS in one regex."""
+    exact: Dict[str, uuid.UUID]
+    contains: Optional[re.Pattern]
+    contains_holdings: Dict[str, uuid.UUID]
+
+    def match(self, search_text: str) -> Optional[uuid.UUID]:
+        holding_id = self.exact.get(search_text)
+        if holding_id is None and self.contains is not None:
+            found = self.contains.search(search_text)
+            if found:
+                holding_id = self.contains_holdings[found.group()]
+        return holding_id
+
+
+def _compile_rules(rules) -> _RuleMatcher:
+    exact: Dict[str, uuid.UUID] = {}
+    contains: Dict[str, uuid.UUID] = {}
+    for rule in rules:
+        pattern = rule.pattern.lower()
+        if rule.match_type == "EXACT":
+            exact.setdefault(pattern, rule.holding_id)
+        elif rule.match_type == "CONTAINS" and pattern:
+            contains.setdefault(pattern, rule.holding_id)
+    regex = None
+    if contains:
+        # Longest first, so the most specific pattern wins where several match at one position
+        regex = re.compile("|".join(re.escape(p) for p in sorted(contains, key=len, reverse=True)))
+    return _RuleMatcher(exact, regex, contains)
+
+
+XIRR_MAX_ITER = 50
+XIRR_TOLERANCE = 1.48e-8  # Same step tolerance as scipy's newton
+# Brent bracket: -99.9% to +1000% a year
+XIRR_BRACKET = (-0.999, 10.0)
+
+
+def _xnpv(rate: float, years: np.ndarray, amounts: np.ndarray) -> float:
+    return float(amounts @ np.power(1.0 + rate, -years))
+
+
+def _xirr(day_offsets: np.ndarray, amounts: np.ndarray) -> float:
+    """
+    XIRR rate for cash flows at `day_offsets` days from the first flow.
+    When NPV changes sign across XIRR_BRACKET, Brent's method is guaranteed to
+    converge there; otherwise (no root in range, or several) fall back to Newton.
+    Raises ValueError when no finite rate is found.
+    """
+    years = np.asarray(day_offsets, dtype=np.float64) / 365.0
+    amounts = np.asarray(amounts, dtype=np.float64)
+    low, high = XIRR_BRACKET
+    npv_low, npv_high = _xnpv(low, years, amounts), _xnpv(high, years, amounts)
+    if math.isfinite(npv_low) and math.isfinite(npv_high) and npv_low * npv_high < 0:
+        return float(optimize.brentq(_xnpv, low, high, args=(years, amounts), xtol=XIRR_TOLERANCE))
+    return _xirr_newton(day_offsets, amounts)
+
+
+def _xirr_newton(day_offsets: np.ndarray, amounts: np.ndarray, guess: float = 0.1) -> float:
+    """
+    XIRR rate for cash flows at `day_offsets` days from the first flow.
+    Each Newton step computes the discount factors once and derives both NPV
+    and its derivative from them, as two dot products over the flow arrays.
+    """
+    years = np.asarray(day_offsets, dtype=np.float64) / 365.0
+    amounts = np.asarray(amounts, dtype=np.float64)
+    weighted = years * amounts
+
+    rate = guess
+    for _ in range(XIRR_MAX_ITER):
+        discount = np.power(1.0 + rate, -years)
+        npv = amounts @ discount
+        npv_prime = -(weighted @ discount) / (1.0 + rate)
+        if npv_prime == 0.0:
+            raise ValueError("XIRR derivative vanished")
+        step = npv / npv_prime
+        rate -= step
+        if not math.isfinite(rate):
+            # e.g. the iteration stepped below -100%, where fractional powers are NaN
+            raise ValueError("XIRR did not converge")
+        if abs(step) < XIRR_TOLERANCE:
+            return float(rate)
+    raise ValueError("XIRR did not converge")
+
+
 class WealthService:
     def __init__(self, db: AsyncSession = Depends(get_db)):
         self.db = db
@@ -41,9 +277,19 @@ class WealthService:
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
+    async def get_holdings_json(self, user_id: uuid.UUID) -> bytes:
+        """Holdings list serialized for the API, cached until the portfolio changes."""
+        cached = holdings_cache.get(user_id)
+        if cached is not None:
+            return cached
+        holdings = await self.get_holdings(user_id)
+        adapter = schemas.HoldingsListAdapter
+        payload = adapter.dump_json(adapter.validate_python(holdings, from_attributes=True))
+        holdings_cache.set(user_id, payload)
+        return payload
+
     async def get_holding_details(self, holding_id: uuid.UUID, user_id: uuid.UUID) -> InvestmentHolding:
-        # Use selectinload to fetch snapshots efficiently
-        from sqlalchemy.orm import selectinload
+        # Snapshots come from one extra SELECT ... WHERE holding_id IN (...), never lazily
         stmt = (
             select(InvestmentHolding)
             .where(InvestmentHolding.id == holding_id, InvestmentHolding.user_id == user_id)
@@ -59,8 +305,6 @@ class WealthService:
 
     async def create_holding(self, user_id: uuid.UUID, data: schemas.InvestmentHoldingCreate) -> InvestmentHolding:
         """Create a new holding. If existing holdings data provided, create synthetic snapshots."""
-        from dateutil.relativedelta import relativedelta
-        
         # Extract onboarding fields
         current_units = data.current_units
         total_invested = data.total_invested
@@ -97,14 +341,12 @@ class WealthService:
             )
             
             # Calculate XIRR from synthetic data
-            try:
-                holding.xirr = await self.calculate_xirr(holding.id)
-            except:
-                logger.warning(f"Could not calculate XIRR for holding {holding.id}")
+            await self._refresh_xirr([holding], date.today())
             
             await self.db.commit()
             await self.db.refresh(holding)
         
+        invalidate_wealth_cache(user_id)
         return holding
     
     async def _create_synthetic_snapshots(
@@ -116,8 +358,6 @@ class WealthService:
         investment_type: str
     ):
         """Create synthetic snapshots for onboarding with existing holdings."""
-        from dateutil.relativedelta import relativedelta
-        
         today = date.today()
         
         # Get current NAV
@@ -133,7 +373,7 @@ class WealthService:
         if investment_type == 'LUMPSUM':
             # Create 2 snapshots: start and today
             snapshots = [
-                InvestmentSnapshot(
+                dict(
                     holding_id=holding.id,
                     user_id=holding.user_id,
                     captured_at=start_date,
@@ -143,7 +383,7 @@ class WealthService:
                     amount_invested_delta=total_invested,
                     is_projected=True
                 ),
-                InvestmentSnapshot(
+                dict(
                     holding_id=holding.id,
                     user_id=holding.user_id,
                     captured_at=today,
@@ -165,44 +405,38 @@ class WealthService:
             # Calculate average SIP amount
             sip_amount = total_invested / months_diff
             
-            # Create monthly snapshots
-            snapshots = []
-            running_units = 0.0
-            running_invested = 0.0
+            # Monthly snapshot dates, up to today
+            snap_dates = [start_date + relativedelta(months=i) for i in range(months_diff + 1)]
+            snap_dates = [d for d in snap_dates if d <= today]
             
-            for i in range(months_diff + 1):
-                snap_date = start_date + relativedelta(months=i)
-                if snap_date > today:
-                    break
-                
-                # Estimate units accumulated so far
-                invested_so_far = sip_amount * (i + 1)
-                units_so_far = (current_units / total_invested) * invested_so_far
-                
-                # Linear NAV interpolation
-                nav_progress = i / months_diff if months_diff > 0 else 1
-                estimated_nav = start_nav + (current_nav - start_nav) * nav_progress
-                
-                running_units = units_so_far
-                running_invested = invested_so_far
-                
-                is_today = snap_date == today
-                
-                snapshots.append(InvestmentSnapshot(
+            # Whole series at once: units accumulated so far, in proportion to
+            # money invested so far, and a linear NAV interpolation
+            i = np.arange(len(snap_dates), dtype=np.float64)
+            invested_so_far = sip_amount * (i + 1)
+            units_so_far = (current_units / total_invested) * invested_so_far
+            estimated_navs = start_nav + (current_nav - start_nav) * (i / months_diff)
+            values = units_so_far * estimated_navs
+            
+            snapshots = [
+                dict(
                     holding_id=holding.id,
                     user_id=holding.user_id,
                     captured_at=snap_date,
-                    units_held=running_units,
-                    price_per_unit=estimated_nav,
-                    total_value=running_units * estimated_nav,
+                    units_held=units,
+                    price_per_unit=nav,
+                    total_value=value,
                     amount_invested_delta=sip_amount,
-                    is_projected=not is_today  # Only today's is real
-                ))
+                    is_projected=snap_date != today  # Only today's is real
+                )
+                for snap_date, units, nav, value in zip(
+                    snap_dates, units_so_far.tolist(), estimated_navs.tolist(), values.tolist()
+                )
+            ]
         
         else:
             # Unknown type, create simple lumpsum
             snapshots = [
-                InvestmentSnapshot(
+                dict(
                     holding_id=holding.id,
                     user_id=holding.user_id,
                     captured_at=today,
@@ -214,69 +448,83 @@ class WealthService:
                 )
             ]
         
-        self.db.add_all(snapshots)
+        # Plain rows in one multi-row INSERT; nothing reads these back, so the ORM
+        # unit of work (identity map, per-object flush) would be pure overhead
+        await self.db.execute(insert(InvestmentSnapshot), snapshots)
         await self.db.commit()
         
         logger.info(f"Created {len(snapshots)} synthetic snapshots for holding {holding.id}")
 
     # --- Pricing & Sync Logic ---
 
+    async def _get_mfapi_scheme(self, scheme_code: str) -> NavSeries:
+        """
+        Full NAV history of a scheme from MFAPI.in. Parsed once per scheme and
+        cached, so each date lookup is a binary search. Concurrent misses for
+        one scheme share a single download.
+        """
+        cached = mfapi_scheme_cache.get(scheme_code)
+        if cached is not None:
+            return cached
+
+        task = _mfapi_downloads.get(scheme_code)
+        if task is None:
+            task = asyncio.ensure_future(_download_mfapi_scheme(scheme_code))
+            _mfapi_downloads[scheme_code] = task
+            task.add_done_callback(lambda _: _mfapi_downloads.pop(scheme_code, None))
+        # Shielded so one cancelled request doesn't abort the download for the others
+        return await asyncio.shield(task)
+
     async def fetch_nav_mfapi(self, scheme_code: str, target_date: Optional[date] = None) -> float:
-        """Fetch NAV from MFAPI.in. If date provided, find closest NAV. Else latest."""
-        url = f"https://api.mfapi.in/mf/{scheme_code}"
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url)
-            if resp.status_code != 200:
-                raise ValueError(f"Invalid MFAPI code: {scheme_code}")
-            data = resp.json().get("data", [])
+        """
+        Fetch NAV from MFAPI.in. If date provided, NAV on that date, or the closest
+        earlier one (weekends, holidays, today's NAV not yet published). Else latest.
+        """
+        series = await self._get_mfapi_scheme(scheme_code)
             
-        if not data:
+        if not len(series.navs):
             raise ValueError("No data found for scheme")
 
-        # Data is list of {date: "dd-mm-yyyy", nav: "str"} sorted desc
-        
         if not target_date:
-            return float(data[0]["nav"])
+            return float(series.navs[-1])
         
-        # Find match for date
-        target_str = target_date.strftime("%d-%m-%Y")
-        
-        # Linear search (list is usually sorted desc)
-        for entry in data:
-            if entry["date"] == target_str:
-                return float(entry["nav"])
-            
-            # If we passed the date (data is strictly descending), we might need to take prev or next
-            # Simplified: Exact match or throw/fallback to closest
-            # Since MF NAVs are daily, let's try to match.
+        idx = series.index_on_or_before(target_date)
+        if idx is not None:
+            return float(series.navs[idx])
             
-        # If strict match failed, let's try parsing and finding closest
-        # This is expensive? Maybe just error for ecosystem simplicity first.
-        # Fallback: Use latest if today, else error.
-        raise ValueError(f"No NAV found for date {target_str}")
+        raise ValueError(f"No NAV found on or before {target_date.strftime('%d-%m-%Y')}")
 
     async def search_mutual_funds(self, query: str) -> List[dict]:
         """Search mutual funds by name using MFAPI.in"""
         if len(query) < 3:
             return []
         
+        key = mf_search_key(query)
+        cached = mf_search_cache.get(key)
+        if cached is not None:
+            return cached
+        
         url = f"https://api.mfapi.in/mf/search?q={query}"
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.get(url, timeout=10.0)
-                if resp.status_code == 200:
-                    return resp.json()
-                return []
-            except Exception as e:
-                logger.error(f"MFAPI search failed: {e}")
-                return []
+        try:
+            resp = await get_http_client().get(url, timeout=10.0)
+            if resp.status_code == 200:
+                results = resp.json()
+                mf_search_cache.set(key, results)
+                return results
+            return []
+        except Exception as e:
+            logger.error(f"MFAPI search failed: {e}")
+            return []
 
     async def fetch_price_yfinance(self, ticker: str, target_date: Optional[date] = None) -> float:
         if not yf:
             raise ValueError("yfinance library missing")
-        
-        # yfinance logic
-        ticker_obj = yf.Ticker(ticker)
+        # Blocking HTTPS under the hood; keep it off the event loop
+        return await asyncio.to_thread(self._fetch_price_yfinance_sync, ticker, target_date)
+
+    @staticmethod
+    def _fetch_price_yfinance_sync(ticker: str, target_date: Optional[date]) -> float:
+        ticker_obj = _get_yf_ticker(ticker)
         if target_date:
             # fetch history around date
             start = target_date
@@ -286,7 +534,7 @@ class WealthService:
                 return float(hist["Close"].iloc[0])
             else:
                  # Try slightly wider window for weekends/holidays
-                 end = target_date + timedelta(days=4)
+                 end = target_date + timedelta(days=YF_PRICE_WINDOW_DAYS)
                  hist = ticker_obj.history(start=start, end=end)
                  if not hist.empty:
                      return float(hist["Close"].iloc[0])
@@ -299,7 +547,7 @@ class WealthService:
              raise ValueError("No current stock price data")
 
     async def get_asset_price(self, holding: InvestmentHolding, target_date: Optional[date] = None) -> float:
-        if holding.asset_type in [AssetType.FD, AssetType.RD, AssetType.PF, AssetType.GRATUITY]:
+        if holding.asset_type in _FIXED_INCOME_TYPES:
             # Fixed income / Computed logic
             # For now return 1.0 or user manually handled. 
             # Actually, PF/Gratuity have specific formulas, but "price per unit" concept applies vaguely
@@ -309,12 +557,21 @@ class WealthService:
         if not holding.ticker_symbol:
              return 1.0 # Fallback for manual assets
 
+        if holding.api_source not in ("MFAPI", "YFINANCE"):
+            return 1.0
+
+        key = (holding.api_source, holding.ticker_symbol, target_date)
+        cached = price_cache.get(key)
+        if cached is not None:
+            return cached
+
         if holding.api_source == "MFAPI":
-            return await self.fetch_nav_mfapi(holding.ticker_symbol, target_date)
-        elif holding.api_source == "YFINANCE":
-            return await self.fetch_price_yfinance(holding.ticker_symbol, target_date)
-            
-        return 1.0
+            price = await self.fetch_nav_mfapi(holding.ticker_symbol, target_date)
+        else:
+            price = await self.fetch_price_yfinance(holding.ticker_symbol, target_date)
+
+        price_cache.set(key, price, ttl=_price_ttl(holding.api_source, target_date))
+        return price
 
     # --- Transaction Mapping & Logic ---
 
@@ -324,6 +581,14 @@ class WealthService:
         Attempts to map a transaction to a holding and update it.
         Returns True if mapped and processed.
         """
+        holding_id = await self.match_transaction_holding(transaction)
+        if holding_id is None:
+            return False
+        await self.add_transaction_to_holding(transaction, holding_id)
+        return True
+
+    async def match_transaction_holding(self, transaction: Transaction) -> Optional[uuid.UUID]:
+        """Holding the user's mapping rules assign this transaction to, if any."""
         if transaction.amount > 0:
              # Income? Or Refund? Typically wealth investment is outgoing (negative amount in transaction usually denotes speinding)
              # But if "Investment" category, a DEBIT (negative) is a BUY. A CREDIT (positive) is a SELL.
@@ -337,164 +602,190 @@ class WealthService:
         # We need to match pattern against merchant_name or remarks or even raw extraction context if possible.
         # Here we only have transaction details.
         
-        stmt = select(InvestmentMappingRule).where(InvestmentMappingRule.user_id == transaction.user_id)
-        result = await self.db.execute(stmt)
-        rules = result.scalars().all()
-        
-        matched_rule = None
+        matcher = await self._get_rule_matcher(transaction.user_id)
         search_text = f"{transaction.merchant_name} {transaction.remarks or ''}".lower()
-        
-        for rule in rules:
-            if rule.match_type == "CONTAINS" and rule.pattern.lower() in search_text:
-                matched_rule = rule
-                break
-            elif rule.match_type == "EXACT" and rule.pattern.lower() == search_text:
-                matched_rule = rule
-                break
-                
-        if not matched_rule:
-            return False
-            
-        # Match found! Execute Logic.
-        holding_id = matched_rule.holding_id
-        await self.add_transaction_to_holding(transaction, holding_id)
-        return True
+        return matcher.match(search_text)
+
+    async def _get_rule_matcher(self, user_id: uuid.UUID) -> _RuleMatcher:
+        """The user's compiled mapping rules; a sync matches many transactions against one load."""
+        matcher = rule_matcher_cache.get(user_id)
+        if matcher is None:
+            stmt = select(
+                InvestmentMappingRule.pattern,
+                InvestmentMappingRule.match_type,
+                InvestmentMappingRule.holding_id
+            ).where(InvestmentMappingRule.user_id == user_id)
+            matcher = _compile_rules(await self.db.execute(stmt))
+            rule_matcher_cache.set(user_id, matcher)
+        return matcher
 
     async def add_transaction_to_holding(self, transaction: Transaction, holding_id: uuid.UUID):
+        await self.add_transactions_to_holding([transaction], holding_id)
+
+    async def add_transactions_to_holding(self, transactions: List[Transaction], holding_id: uuid.UUID):
         """
-        Calculates units and updates snapshot.
+        Calculates units and updates snapshots for each transaction.
         Transaction Amount < 0 => BUY (usually).
         Transaction Amount > 0 => SELL.
         Wait, standard logic: Debit (negative) -> Money leaves account -> Enters Investment -> Buy.
         Credit (positive) -> Money enters account -> Leaves Investment -> Sell.
+
+        The holding's snapshots are loaded once and merged in memory, then the
+        history is recalculated and committed once for the whole batch.
         """
         holding = await self.db.get(InvestmentHolding, holding_id)
-        if not holding:
+        if not holding or not transactions:
             return
 
-        amount = transaction.amount
-        txn_date = transaction.transaction_date or date.today()
-        
-        # Calculate Amount Invested Delta
-        # If Amount = -1000 (Debit), we invested 1000. Delta = +1000.
-        # If Amount = +1000 (Credit), we sold 1000. Delta = -1000? 
-        # Actually XIRR expects: Dates, Cashflow.
-        # Buy: -1000 cashflow for user. 
-        # But here 'amount_invested_delta' tracks what went INTO the asset.
-        invested_delta = float(-amount)
-        
-        # Get Price
-        try:
-            price = await self.get_asset_price(holding, txn_date)
-        except Exception as e:
-            logger.error(f"Failed to fetch price for {holding.name}: {e}")
-            price = 1.0 # Fallback? Or fail?
-            
-        units = 0.0
-        if price > 0:
-            units = invested_delta / price
-            
-        # Create Snapshot for this specific transaction action
-        # Note: We might already have a snapshot for this day? 
-        # If so, update it? Or just insert new one?
-        # Prophet works better with daily aggregates. 
-        # But we also want to track the explicit "Buy" action.
-        # Let's see models: "captured_at" is Date. Unique index? 
-        # "Index heavily on (user_id, captured_at)" was requested.
-        # We should merge with existing snapshot if exists for that day.
-        
-        stmt = select(InvestmentSnapshot).where(
-            and_(
-                InvestmentSnapshot.holding_id == holding_id,
-                InvestmentSnapshot.captured_at == txn_date
-            )
+        snapshots_stmt = (
+            select(InvestmentSnapshot)
+            .where(InvestmentSnapshot.holding_id == holding_id)
+            .order_by(InvestmentSnapshot.captured_at)
         )
-        existing = (await self.db.execute(stmt)).scalar_one_or_none()
-        
-        if existing:
-            existing.units_held += units
-            existing.amount_invested_delta += invested_delta
-            # Update total value based on new units * price (which we just fetched)
-            existing.price_per_unit = price
-            existing.total_value = existing.units_held * price
-        else:
-            # We need to know previous units to add to?
-            # Or is this snapshot just the delta? 
-            # "Time-series table... total_value". It implies Cumulative State.
-            # So we need previous day's units.
+        snapshots = list((await self.db.execute(snapshots_stmt)).scalars().all())
+        snapshot_dates = [snap.captured_at for snap in snapshots]
+
+        for transaction in transactions:
+            amount = transaction.amount
+            txn_date = transaction.transaction_date or date.today()
             
-            # Find closest previous snapshot
-            prev_stmt = (
-                select(InvestmentSnapshot)
-                .where(
-                    InvestmentSnapshot.holding_id == holding_id,
-                    InvestmentSnapshot.captured_at < txn_date
-                )
-                .order_by(desc(InvestmentSnapshot.captured_at))
-                .limit(1)
-            )
-            prev = (await self.db.execute(prev_stmt)).scalar_one_or_none()
-            prev_units = prev.units_held if prev else 0.0
+            # Calculate Amount Invested Delta
+            # If Amount = -1000 (Debit), we invested 1000. Delta = +1000.
+            # If Amount = +1000 (Credit), we sold 1000. Delta = -1000? 
+            # Actually XIRR expects: Dates, Cashflow.
+            # Buy: -1000 cashflow for user. 
+            # But here 'amount_invested_delta' tracks what went INTO the asset.
+            invested_delta = float(-amount)
             
-            new_units = prev_units + units
-            snap = InvestmentSnapshot(
-                holding_id=holding_id,
-                user_id=transaction.user_id,
-                captured_at=txn_date,
-                units_held=new_units,
-                price_per_unit=price,
-                total_value=new_units * price,
-                amount_invested_delta=invested_delta
-            )
-            self.db.add(snap)
+            # Get Price
+            try:
+                price = await self.get_asset_price(holding, txn_date)
+            except Exception as e:
+                logger.error(f"Failed to fetch price for {holding.name}: {e}")
+                price = 1.0 # Fallback? Or fail?
+                
+            units = 0.0
+            if price > 0:
+                units = invested_delta / price
+                
+            # Merge with the existing snapshot for that day, if any, so Prophet
+            # sees daily aggregates. Snapshots are cumulative state, so a new
+            # one starts from the closest previous day's units.
+            pos = bisect.bisect_left(snapshot_dates, txn_date)
+            if pos < len(snapshots) and snapshot_dates[pos] == txn_date:
+                existing = snapshots[pos]
+                existing.units_held += units
+                existing.amount_invested_delta += invested_delta
+                # Update total value based on new units * price (which we just fetched)
+                existing.price_per_unit = price
+                existing.total_value = existing.units_held * price
+            else:
+                prev_units = snapshots[pos - 1].units_held if pos > 0 else 0.0
+                new_units = prev_units + units
+                snap = InvestmentSnapshot(
+                    holding_id=holding_id,
+                    user_id=transaction.user_id,
+                    captured_at=txn_date,
+                    units_held=new_units,
+                    price_per_unit=price,
+                    total_value=new_units * price,
+                    amount_invested_delta=invested_delta
+                )
+                self.db.add(snap)
+                snapshots.insert(pos, snap)
+                snapshot_dates.insert(pos, txn_date)
             
-        # Also, if we added a transaction in the PAST, we must propagate unit changes to ALL future snapshots.
-        # This is complex. "Event sourcing" preferred but expensive.
-        # We can run a "recalculate_holding" task.
-        await self.recalculate_holding_history(holding_id)
+        # A transaction in the PAST changes units for ALL later snapshots,
+        # so re-run the chain once for the whole batch.
+        self._recalculate_from_snapshots(holding, snapshots)
         
         await self.db.commit()
+        invalidate_wealth_cache(holding.user_id)
 
     async def recalculate_holding_history(self, holding_id: uuid.UUID):
         """
         Re-runs the chain of units from start to finish.
         Used when inserting/updating a past transaction.
+
+        Runs in the database: a running SUM() window re-derives every snapshot's
+        units, applied by one UPDATE ... FROM, without loading the snapshots.
+        Callers that already hold the snapshots use _recalculate_from_snapshots.
         """
-        snapshots_stmt = (
-            select(InvestmentSnapshot)
+        price = case(
+            (InvestmentSnapshot.price_per_unit > 0, InvestmentSnapshot.price_per_unit),
+            else_=1.0 # Safety
+        )
+        chain = (
+            select(
+                InvestmentSnapshot.id,
+                price.label("price"),
+                func.sum(InvestmentSnapshot.amount_invested_delta / price).over(
+                    order_by=(InvestmentSnapshot.captured_at, InvestmentSnapshot.id)
+                ).label("units")
+            )
             .where(InvestmentSnapshot.holding_id == holding_id)
-            .order_by(InvestmentSnapshot.captured_at)
+            .subquery()
+        )
+        await self.db.execute(
+            update(InvestmentSnapshot)
+            .where(InvestmentSnapshot.id == chain.c.id)
+            .values(
+                price_per_unit=chain.c.price,
+                units_held=chain.c.units,
+                total_value=chain.c.units * chain.c.price
+            )
+            .execution_options(synchronize_session=False)
         )
-        snapshots = (await self.db.execute(snapshots_stmt)).scalars().all()
         
-        running_units = 0.0
-        total_invested = 0.0
+        # Update Holding Master Record from the recalculated chain
+        last_stmt = (
+            select(InvestmentSnapshot.captured_at, InvestmentSnapshot.total_value)
+            .where(InvestmentSnapshot.holding_id == holding_id)
+            .order_by(desc(InvestmentSnapshot.captured_at), desc(InvestmentSnapshot.id))
+            .limit(1)
+        )
+        last = (await self.db.execute(last_stmt)).first()
+        if last is None:
+            return
+        invested_stmt = select(func.sum(InvestmentSnapshot.amount_invested_delta)).where(
+            InvestmentSnapshot.holding_id == holding_id
+        )
+        holding = await self.db.get(InvestmentHolding, holding_id)
+        holding.current_value = last.total_value
+        holding.total_invested = (await self.db.execute(invested_stmt)).scalar_one()
+        holding.last_updated_at = datetime.now()
         
-        for snap in snapshots:
-            # We assume amount_invested_delta is the source of truth for "Activity" on that day
-            # If units were derived from price, we might need to preserve that ratio.
-            # But simpler: Re-calculate units from delta / price.
-            
-            if snap.price_per_unit <= 0: snap.price_per_unit = 1.0 # Safety
-            
-            # Re-derive units for this day's action (convert Decimal to float)
-            day_units = float(snap.amount_invested_delta) / float(snap.price_per_unit)
-            
-            running_units += day_units
-            total_invested += float(snap.amount_invested_delta)
-            
-            snap.units_held = running_units
-            snap.total_value = snap.units_held * float(snap.price_per_unit)
+        # Trigger XIRR calc, valued at the last snapshot
+        await self._refresh_xirr([holding], last.captured_at)
+
+    def _recalculate_from_snapshots(self, holding: InvestmentHolding, snapshots: List[InvestmentSnapshot]):
+        """Re-derive units and values of date-ordered `snapshots`, then the holding totals."""
+        if not snapshots:
+            return
+        
+        # We assume amount_invested_delta is the source of truth for "Activity" on that day
+        # If units were derived from price, we might need to preserve that ratio.
+        # But simpler: Re-calculate units from delta / price, as a running sum.
+        n = len(snapshots)
+        deltas = np.fromiter((float(s.amount_invested_delta) for s in snapshots), dtype=np.float64, count=n)
+        prices = np.fromiter((float(s.price_per_unit) for s in snapshots), dtype=np.float64, count=n)
+        prices[prices <= 0] = 1.0 # Safety
+        
+        units = np.cumsum(deltas / prices)
+        totals = units * prices
+        
+        for snap, price, units_held, total_value in zip(snapshots, prices.tolist(), units.tolist(), totals.tolist()):
+            snap.price_per_unit = price
+            snap.units_held = units_held
+            snap.total_value = total_value
             
         # Update Holding Master Record
-        holding = await self.db.get(InvestmentHolding, holding_id)
-        if snapshots:
-            holding.current_value = snapshots[-1].total_value
-            holding.total_invested = total_invested
-            holding.last_updated_at = datetime.now()
-            
-            # Trigger XIRR calc
-            holding.xirr = self.calculate_xirr(snapshots)
+        holding.current_value = snapshots[-1].total_value
+        holding.total_invested = float(deltas.sum())
+        holding.last_updated_at = datetime.now()
+        
+        # Trigger XIRR calc
+        holding.xirr = self.calculate_xirr(snapshots)
 
     def calculate_xirr(self, snapshots: List[InvestmentSnapshot]) -> float:
         """
@@ -505,99 +796,134 @@ class WealthService:
         if not snapshots:
             return 0.0
             
-        dates = []
-        amounts = []
-        
-        for s in snapshots:
-            if abs(s.amount_invested_delta) > 0.01:
-                dates.append(s.captured_at)
-                # In XIRR:
-                # Outflow (Investment) is negative.
-                # Here amount_invested_delta is +ve for investment.
-                # So we flip sign => -s.amount_invested_delta
-                amounts.append(-s.amount_invested_delta)
-        
-        # Terminal Value
-        last_snap = snapshots[-1]
-        dates.append(last_snap.captured_at)
-        amounts.append(last_snap.total_value) # Positive inflow if we sold it all today
-        
-        if len(amounts) < 2:
+        flows = [s for s in snapshots if abs(s.amount_invested_delta) > 0.01]
+        if not flows:
             return 0.0
-            
-        # Scipy XIRR Logic
-        # Newton-Raphson method
-        # 0 = sum( amount_i / (1 + xirr)^((date_i - date_0)/365) )
         
+        # In XIRR, outflows (investments) are negative; amount_invested_delta is +ve
+        # for an investment, so flip its sign. The last snapshot's value is the
+        # terminal inflow, as if we sold it all on that day.
+        last_snap = snapshots[-1]
+        n = len(flows)
+        dates_ord = np.empty(n + 1, dtype=np.float64)
+        dates_ord[:n] = np.fromiter((s.captured_at.toordinal() for s in flows), dtype=np.float64, count=n)
+        dates_ord[n] = last_snap.captured_at.toordinal()
+        amounts = np.empty(n + 1, dtype=np.float64)
+        amounts[:n] = np.fromiter((-s.amount_invested_delta for s in flows), dtype=np.float64, count=n)
+        amounts[n] = last_snap.total_value
+        
+        # Solve 0 = sum( amount_i / (1 + xirr)^((date_i - date_0)/365) ). If it fails, return 0.
         try:
-            dates_ord = [d.toordinal() for d in dates]
-            d0 = dates_ord[0]
-            
-            def xnpv(rate):
-                return sum([a / pow(1 + rate, (d - d0) / 365.0) for a, d in zip(amounts, dates_ord)])
-                
-            def xnpv_prime(rate):
-                 return sum([- (d - d0) / 365.0 * a / pow(1 + rate, (d - d0) / 365.0 + 1) for a, d in zip(amounts, dates_ord)])
-
-            # Initial guess 0.1 (10%)
-            # If newton fails, return 0
-            res = optimize.newton(xnpv, 0.1, fprime=xnpv_prime, maxiter=50)
-            return res * 100 # Return percentage
+            return _xirr(dates_ord - dates_ord[0], amounts) * 100 # Return percentage
         except Exception:
             return 0.0
 
+    async def _refresh_xirr(self, holdings: List[InvestmentHolding], as_of: date):
+        """
+        Recompute the stored `xirr` of several holdings from their investment flows,
+        valued at each holding's current_value on `as_of`. One query for all flows,
+        so the denormalized column stays fresh without a per-holding round trip.
+        """
+        if not holdings:
+            return
+        flows_stmt = (
+            select(
+                InvestmentSnapshot.holding_id,
+                InvestmentSnapshot.captured_at,
+                InvestmentSnapshot.amount_invested_delta
+            )
+            .where(InvestmentSnapshot.holding_id.in_([h.id for h in holdings]))
+            .where(func.abs(InvestmentSnapshot.amount_invested_delta) > 0.01)
+            .order_by(InvestmentSnapshot.captured_at)
+        )
+        flows_by_holding = {}
+        for row in await self.db.execute(flows_stmt):
+            flows_by_holding.setdefault(row.holding_id, []).append(row)
+
+        for holding in holdings:
+            flows = flows_by_holding.get(holding.id)
+            if not flows:
+                continue
+            # Investments are outflows (negative); the current value is the terminal inflow
+            day_ords = np.array([f.captured_at.toordinal() for f in flows] + [as_of.toordinal()], dtype=np.float64)
+            amounts = np.array([-f.amount_invested_delta for f in flows] + [holding.current_value], dtype=np.float64)
+            try:
+                holding.xirr = _xirr(day_ords - day_ords[0], amounts) * 100
+            except Exception:
+                holding.xirr = 0.0
+
     # --- Forecasting ---
 
     async def generate_forecast(self, user_id: uuid.UUID, years: int = 10) -> schemas.ForecastResponse:
+        # Prophet fits are expensive; reuse a recent forecast for the same horizon
+        key = (user_id, years)
+        cached = forecast_cache.get(key)
+        if cached is not None:
+            return cached
+        forecast = await self._build_forecast(user_id, years)
+        forecast_cache.set(key, forecast)
+        return forecast
+
+    async def _build_forecast(self, user_id: uuid.UUID, years: int) -> schemas.ForecastResponse:
         if not Prophet:
             return schemas.ForecastResponse(forecast=[], summary_text="Prophet forecasting unavailable.")
             
-        # 1. Aggregate total portfolio value by day
-        stmt = (
+        # 1. Aggregate total portfolio value by day, then average it per week, in the
+        # database: Prophet fits a fraction of the points and far fewer rows come back
+        day_total = func.sum(InvestmentSnapshot.total_value)
+        daily = (
             select(
-                InvestmentSnapshot.captured_at,
-                func.sum(InvestmentSnapshot.total_value).label("total_val")
+                InvestmentSnapshot.captured_at.label("day"),
+                day_total.label("total_val"),
+                # Latest day's total, repeated on every row: the growth baseline
+                func.first_value(day_total).over(order_by=desc(InvestmentSnapshot.captured_at)).label("latest_val")
             )
             .where(InvestmentSnapshot.user_id == user_id)
             .group_by(InvestmentSnapshot.captured_at)
-            .order_by(InvestmentSnapshot.captured_at)
+            .subquery()
+        )
+        week = cast(func.date_trunc("week", daily.c.day), Date)
+        stmt = (
+            select(
+                week.label("captured_at"),
+                func.avg(daily.c.total_val).label("total_val"),
+                func.max(daily.c.latest_val).label("latest_val")
+            )
+            .group_by(week)
+            .order_by(week)
         )
         
         rows = (await self.db.execute(stmt)).all()
-        if len(rows) < 30: # Need some history
-            return schemas.ForecastResponse(forecast=[], summary_text="Insufficient data for forecasting (need >30 data points).")
+        if len(rows) < MIN_FORECAST_WEEKS: # Need some history
+            return schemas.ForecastResponse(
+                forecast=[],
+                summary_text=f"Insufficient data for forecasting (need at least {MIN_FORECAST_WEEKS} weeks of history)."
+            )
             
-        df = pd.DataFrame(rows, columns=['ds', 'y'])
-        
-        # Prophet setup
-        m = Prophet(daily_seasonality=False, yearly_seasonality=True)
-        m.fit(df)
-        
-        future = m.make_future_dataframe(periods=years * 365)
-        forecast = m.predict(future)
-        
-        # Extract relevant points
-        # Filter strictly future
-        last_date = pd.to_datetime(df['ds'].max())
-        future_forecast = forecast[forecast['ds'] > last_date]
-        
-        # Downsample to weekly or monthly to save bandwidth? 
-        # API requires returning 'ForecastPoint'.
-        
-        result_points = []
-        for index, row in future_forecast.iterrows():
-            # Monthly sampling
-            if row['ds'].day == 1:
-                result_points.append(schemas.ForecastPoint(
-                    date=row['ds'].date(),
-                    yhat=row['yhat'],
-                    yhat_lower=row['yhat_lower'],
-                    yhat_upper=row['yhat_upper']
-                ))
+        history = [(row.captured_at, float(row.total_val)) for row in rows]
+
+        # Fitting is the slow part; reuse the model while the history is unchanged.
+        # Comparing the weekly rows also catches writes handled by other workers.
+        cached = prophet_model_cache.get(user_id)
+        model_json = cached[1] if cached is not None and cached[0] == history else None
+
+        # Fit and predict in a worker process so neither holds the GIL or the event loop
+        loop = asyncio.get_running_loop()
+        model_json, points = await loop.run_in_executor(
+            get_prophet_pool(), run_prophet, history, years, model_json
+        )
+        prophet_model_cache.set(user_id, (history, model_json))
+
+        # The values are plain floats/dates from the model, so points skip Pydantic validation
+        result_points = [
+            schemas.ForecastPoint.model_construct(date=d, yhat=yhat, yhat_lower=lower, yhat_upper=upper)
+            for d, yhat, lower, upper in points
+        ]
                 
         # Calculate summary metrics
         final_val = result_points[-1].yhat if result_points else 0
-        current_val = rows[-1].total_val
+        # The last weekly point averages a partial week; grow from the latest daily total
+        current_val = rows[-1].latest_val
         growth = ((final_val - current_val) / current_val) * 100 if current_val > 0 else 0
         
         summary = f"Projected growth: {growth:.1f}%"
@@ -605,7 +931,7 @@ class WealthService:
         return schemas.ForecastResponse(
             forecast=result_points,
             history=[
-                schemas.ForecastPoint(
+                schemas.ForecastPoint.model_construct(
                     date=row.captured_at,
                     yhat=row.total_val,
                     yhat_lower=row.total_val,
@@ -641,53 +967,142 @@ class WealthService:
                 )
                 self.db.add(rule)
                 await self.db.commit()
+                rule_matcher_cache.delete(transaction.user_id)
                 
         return True
 
-    async def sync_all_holdings_prices(self):
+    async def _fetch_prices(self, holdings: List[InvestmentHolding], target_date: date) -> Dict[uuid.UUID, float]:
+        """
+        Price each holding for `target_date`. Every distinct (api_source, ticker)
+        is fetched once, and the fetches run concurrently.
+        """
+        groups: Dict[tuple, List[InvestmentHolding]] = {}
+        for holding in holdings:
+            key = holding.id if holding.asset_type in _FIXED_INCOME_TYPES else (holding.api_source, holding.ticker_symbol)
+            groups.setdefault(key, []).append(holding)
+        grouped = list(groups.values())
+
+        await self._prefetch_yfinance_prices(grouped, target_date)
+
+        slots = asyncio.Semaphore(PRICE_FETCH_CONCURRENCY)
+
+        async def fetch(group: List[InvestmentHolding]) -> float:
+            async with slots:
+                return await self.get_asset_price(group[0], target_date)
+
+        results = await asyncio.gather(*(fetch(group) for group in grouped), return_exceptions=True)
+
+        prices = {}
+        for group, result in zip(grouped, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch price for {group[0].ticker_symbol}: {result}")
+                continue
+            for holding in group:
+                prices[holding.id] = result
+        return prices
+
+    async def _prefetch_yfinance_prices(self, grouped: List[List[InvestmentHolding]], target_date: date):
+        """
+        Download every uncached Yahoo ticker in one batched request and seed
+        price_cache with the results. Tickers the batch misses fall through to
+        the per-ticker lookup in get_asset_price.
+        """
+        if not yf:
+            return
+        tickers = [
+            group[0].ticker_symbol for group in grouped
+            if group[0].api_source == "YFINANCE"
+            and group[0].asset_type not in _FIXED_INCOME_TYPES
+            and price_cache.get(("YFINANCE", group[0].ticker_symbol, target_date)) is None
+        ]
+        if len(tickers) < 2:
+            return
+        try:
+            closes = await asyncio.to_thread(_download_yf_closes, tickers, target_date)
+        except Exception as e:
+            logger.warning(f"Batched yfinance download failed, pricing tickers one by one: {e}")
+            return
+        ttl = _price_ttl("YFINANCE", target_date)
+        for ticker, price in closes.items():
+            price_cache.set(("YFINANCE", ticker, target_date), price, ttl=ttl)
+
+    async def _set_statement_timeout(self, statement_timeout: Optional[str]):
+        """SET LOCAL statement_timeout on the transaction this statement begins (Postgres only)."""
+        if statement_timeout and self.db.bind.dialect.name == "postgresql":
+            await self.db.execute(text(f"SET LOCAL statement_timeout = '{statement_timeout}'"))
+
+    async def sync_user_prices(self, user_id: uuid.UUID):
+        """Refresh prices for one user's market-linked holdings."""
+        stmt = select(InvestmentHolding.id).where(
+            InvestmentHolding.user_id == user_id,
+            InvestmentHolding.ticker_symbol.isnot(None)
+        )
+        holding_ids = (await self.db.execute(stmt)).scalars().all()
+        if holding_ids:
+            await self.sync_all_holdings_prices(holding_ids=holding_ids)
+
+    async def sync_all_holdings_prices(
+        self,
+        holding_ids: Optional[List[uuid.UUID]] = None,
+        statement_timeout: Optional[str] = None
+    ):
         """
         Fetches latest price for all holdings and updates snapshots for today.
+        If holding_ids is given, only those holdings are synced. A statement_timeout
+        (e.g. "30s") is applied to each of the sync's transactions on Postgres.
         """
         # Fetch all active holdings
+        await self._set_statement_timeout(statement_timeout)
         stmt = select(InvestmentHolding)
+        if holding_ids is not None:
+            stmt = stmt.where(InvestmentHolding.id.in_(holding_ids))
         result = await self.db.execute(stmt)
         holdings = result.scalars().all()
+        # End the read transaction before the network phase, so the connection isn't
+        # left idle in transaction (and pinned by a transaction-mode pooler) while
+        # quotes are fetched. expire_on_commit=False keeps the holdings loaded.
+        await self.db.commit()
         
         today = date.today()
+        repriced = []
+        
+        # Phase 1: every quote, fetched concurrently before any DB work
+        priced = [holding for holding in holdings if holding.ticker_symbol]
+        prices = await self._fetch_prices(priced, today)
+        
+        # Phase 2: apply them in a fresh transaction. One DISTINCT ON query returns each
+        # repriced holding's latest snapshot up to today: today's own to update, or the
+        # one to carry units from.
+        latest_snapshots = {}
+        if prices:
+            await self._set_statement_timeout(statement_timeout)
+            latest_stmt = (
+                select(InvestmentSnapshot)
+                .distinct(InvestmentSnapshot.holding_id)
+                .where(
+                    InvestmentSnapshot.holding_id.in_(list(prices)),
+                    InvestmentSnapshot.captured_at <= today
+                )
+                .order_by(InvestmentSnapshot.holding_id, desc(InvestmentSnapshot.captured_at))
+            )
+            latest_snapshots = {snap.holding_id: snap for snap in (await self.db.execute(latest_stmt)).scalars()}
         
-        for holding in holdings:
-            if not holding.ticker_symbol:
+        for holding in priced:
+            price = prices.get(holding.id)
+            if price is None or price <= 0:
                 continue
                 
             try:
-                price = await self.get_asset_price(holding, today)
-                if price <= 0: continue
-                
-                # Check for existing snapshot today to update
-                snap_stmt = select(InvestmentSnapshot).where(
-                    and_(
-                        InvestmentSnapshot.holding_id == holding.id,
-                        InvestmentSnapshot.captured_at == today
-                    )
-                )
-                existing = (await self.db.execute(snap_stmt)).scalar_one_or_none()
+                latest = latest_snapshots.get(holding.id)
+                # Existing snapshot today to update
+                existing = latest if latest is not None and latest.captured_at == today else None
                 
                 if existing:
                     existing.price_per_unit = price
                     existing.total_value = existing.units_held * price
                 else:
                     # Create new snapshot based on previous day's units
-                    prev_stmt = (
-                        select(InvestmentSnapshot)
-                        .where(
-                            InvestmentSnapshot.holding_id == holding.id,
-                            InvestmentSnapshot.captured_at < today
-                        )
-                        .order_by(desc(InvestmentSnapshot.captured_at))
-                        .limit(1)
-                    )
-                    prev = (await self.db.execute(prev_stmt)).scalar_one_or_none()
-                    units = prev.units_held if prev else 0.0
+                    units = latest.units_held if latest is not None else 0.0
                     
                     if units > 0:
                         new_snap = InvestmentSnapshot(
@@ -704,11 +1119,17 @@ class WealthService:
                 # Update holding master
                 holding.current_value = (existing.units_held * price) if existing else (units * price)
                 holding.last_updated_at = datetime.now()
+                repriced.append(holding)
                 
             except Exception as e:
                 logger.error(f"Failed to sync price for {holding.name}: {e}")
+        
+        # Re-value the stored XIRR alongside current_value
+        await self._refresh_xirr(repriced, today)
                 
         await self.db.commit()
+        for user_id in {holding.user_id for holding in holdings}:
+            invalidate_wealth_cache(user_id)
 
     # --- CAMS Import Feature ---
     
@@ -727,31 +1148,41 @@ class WealthService:
         sip_patterns_detected = 0
         errors = []
         
-        # Group transactions by scheme name
-        from collections import defaultdict
-        scheme_groups = defaultdict(list)
+        # Group transactions by scheme name, each group in date order: one stable
+        # vectorized sort over the whole statement instead of a sort per scheme
+        frame = pd.DataFrame({
+            "scheme_name": [t.scheme_name for t in request.transactions],
+            "transaction_date": pd.to_datetime([t.transaction_date for t in request.transactions])
+        })
+        frame.sort_values(["scheme_name", "transaction_date"], kind="stable", inplace=True)
+        scheme_groups = {
+            scheme_name: [request.transactions[i] for i in labels]
+            for scheme_name, labels in frame.groupby("scheme_name", sort=False).groups.items()
+        }
+        
+        # Existing holdings for every scheme in the statement, in one query
+        stmt = select(InvestmentHolding).where(
+            and_(
+                InvestmentHolding.user_id == user_id,
+                InvestmentHolding.name.in_(scheme_groups.keys())
+            )
+        )
+        holdings_by_name = {h.name: h for h in (await self.db.execute(stmt)).scalars()}
         
-        for txn in request.transactions:
-            scheme_groups[txn.scheme_name].append(txn)
+        # New snapshot rows for the whole statement, written in one multi-row INSERT
+        new_snapshots = []
         
         # Process each scheme
         for scheme_name, txns in scheme_groups.items():
             try:
-                # Sort transactions by date
-                txns.sort(key=lambda x: x.transaction_date)
-                
-                # Check if holding exists
-                stmt = select(InvestmentHolding).where(
-                    and_(
-                        InvestmentHolding.user_id == user_id,
-                        InvestmentHolding.name == scheme_name
-                    )
-                )
-                holding = (await self.db.execute(stmt)).scalar_one_or_none()
+                holding = holdings_by_name.get(scheme_name)
+                is_new_holding = False
                 
                 if not holding and request.auto_create_holdings:
-                    # Create new holding
+                    # Create new holding; the id is assigned up front so snapshots can
+                    # reference it and everything is inserted in one flush at the end
                     holding = InvestmentHolding(
+                        id=uuid.uuid4(),
                         user_id=user_id,
                         name=scheme_name,
                         asset_type=AssetType.MUTUAL_FUND,
@@ -760,8 +1191,7 @@ class WealthService:
                         total_invested=0.0
                     )
                     self.db.add(holding)
-                    await self.db.commit()
-                    await self.db.refresh(holding)
+                    is_new_holding = True
                     holdings_created += 1
                 elif holding:
                     holdings_updated += 1
@@ -776,22 +1206,39 @@ class WealthService:
                     if is_sip_pattern:
                         sip_patterns_detected += 1
                 
+                # Snapshots already stored on the statement's dates, fetched once per scheme
+                # (a holding created by this import has none)
+                existing_snaps = {}
+                if not is_new_holding:
+                    snap_stmt = select(InvestmentSnapshot).where(
+                        and_(
+                            InvestmentSnapshot.holding_id == holding.id,
+                            InvestmentSnapshot.captured_at.in_({t.transaction_date for t in txns})
+                        )
+                    )
+                    existing_snaps = {s.captured_at: s for s in (await self.db.execute(snap_stmt)).scalars()}
+                
+                # Buy snapshots this import adds for the scheme, by date, so a second buy
+                # on the same date (e.g. SIP plus dividend reinvest) merges into the first
+                pending_snaps = {}
+                
                 # Process each transaction
                 running_units = 0.0
+                net_investment = 0.0
                 prev_txn = None
                 
                 for txn in txns:
                     t_type = txn.transaction_type.lower()
                     
-                    # Broad matching for Buy transactions
-                    is_buy = any(x in t_type for x in ['purchase', 'sip', 'switch in', 'dividend', 'invest', 'reinvest'])
-                    # Broad matching for Sell transactions 
-                    is_sell = any(x in t_type for x in ['redemption', 'sell', 'switch out', 'withdraw'])
+                    # Broad matching; a type that looks like both counts as a buy
+                    is_buy = any(x in t_type for x in CAMS_BUY_KEYWORDS)
+                    is_sell = not is_buy and any(x in t_type for x in CAMS_SELL_KEYWORDS)
 
                     if is_buy:
                         # Buy transaction
                         running_units += txn.units
                         invested_delta = txn.amount
+                        net_investment += invested_delta
                         
                         # Detect step-up or skip
                         is_step_up = False
@@ -817,21 +1264,21 @@ class WealthService:
                             sip_amount = txn.amount
                         
                         # Create or update snapshot
-                        snap_stmt = select(InvestmentSnapshot).where(
-                            and_(
-                                InvestmentSnapshot.holding_id == holding.id,
-                                InvestmentSnapshot.captured_at == txn.transaction_date
-                            )
-                        )
-                        existing_snap = (await self.db.execute(snap_stmt)).scalar_one_or_none()
+                        existing_snap = existing_snaps.get(txn.transaction_date)
+                        pending_snap = pending_snaps.get(txn.transaction_date)
                         
                         if existing_snap:
                             existing_snap.units_held = running_units
                             existing_snap.price_per_unit = txn.nav
                             existing_snap.total_value = running_units * txn.nav
                             existing_snap.amount_invested_delta += invested_delta
+                        elif pending_snap:
+                            pending_snap["units_held"] = running_units
+                            pending_snap["price_per_unit"] = txn.nav
+                            pending_snap["total_value"] = running_units * txn.nav
+                            pending_snap["amount_invested_delta"] += invested_delta
                         else:
-                            snapshot = InvestmentSnapshot(
+                            pending_snap = dict(
                                 holding_id=holding.id,
                                 user_id=user_id,
                                 captured_at=txn.transaction_date,
@@ -846,7 +1293,8 @@ class WealthService:
                                 skip_reason=skip_reason,
                                 extra_data=metadata if metadata else None
                             )
-                            self.db.add(snapshot)
+                            new_snapshots.append(pending_snap)
+                            pending_snaps[txn.transaction_date] = pending_snap
                         
                         transactions_processed += 1
                         prev_txn = txn
@@ -855,8 +1303,9 @@ class WealthService:
                         # Sell transaction
                         running_units -= txn.units
                         invested_delta = -txn.amount
+                        net_investment += invested_delta
                         
-                        snapshot = InvestmentSnapshot(
+                        new_snapshots.append(dict(
                             holding_id=holding.id,
                             user_id=user_id,
                             captured_at=txn.transaction_date,
@@ -864,22 +1313,12 @@ class WealthService:
                             price_per_unit=txn.nav,
                             total_value=running_units * txn.nav,
                             amount_invested_delta=invested_delta
-                        )
-                        self.db.add(snapshot)
+                        ))
                         transactions_processed += 1
                 
                 # Update holding totals manually to preserve unit counts from CSV
                 # (recalculate_holding_history is destructive if NAV is missing)
                 
-                # Calculate net investment for this batch
-                net_investment = 0.0
-                for txn in txns:
-                    t_type = txn.transaction_type.lower()
-                    if any(x in t_type for x in ['purchase', 'sip', 'switch in', 'dividend', 'invest', 'reinvest']):
-                        net_investment += txn.amount
-                    elif any(x in t_type for x in ['redemption', 'sell', 'switch out', 'withdraw']):
-                        net_investment -= txn.amount
-                
                 holding.total_invested += net_investment
                 
                 # Update current value using last known NAV from import
@@ -895,7 +1334,12 @@ class WealthService:
                 logger.error(f"Error processing scheme {scheme_name}: {e}")
                 errors.append(f"{scheme_name}: {str(e)}")
         
+        if new_snapshots:
+            # Holdings created above must be inserted before their snapshots reference them
+            await self.db.flush()
+            await self.db.execute(insert(InvestmentSnapshot), new_snapshots)
         await self.db.commit()
+        invalidate_wealth_cache(user_id)
         
         return schemas.CAMSImportResponse(
             holdings_created=holdings_created,
@@ -911,14 +1355,16 @@ class WealthService:
             return False
         
         # Check for regular intervals (25-35 days)
-        intervals = []
-        for i in range(1, len(transactions)):
-            days = (transactions[i].transaction_date - transactions[i-1].transaction_date).days
-            intervals.append(days)
+        ords = np.fromiter(
+            (t.transaction_date.toordinal() for t in transactions),
+            dtype=np.int64,
+            count=len(transactions)
+        )
+        intervals = np.diff(ords)
         
         # Most intervals should be 25-35 days (monthly)
-        monthly_count = sum(1 for d in intervals if 25 <= d <= 35)
-        return monthly_count >= len(intervals) * 0.7  # 70% threshold
+        monthly_count = np.count_nonzero((intervals >= 25) & (intervals <= 35))
+        return bool(monthly_count >= intervals.size * 0.7)  # 70% threshold
 
     # --- SIP Date-Specific Performance Analysis ---
     
@@ -942,7 +1388,6 @@ class WealthService:
         
         # Extract user's most common SIP date
         sip_dates = [s.captured_at.day for s in sip_snapshots]
-        from collections import Counter
         most_common_date = Counter(sip_dates).most_common(1)[0][0]
         
         # Calculate average SIP amount
@@ -953,22 +1398,15 @@ class WealthService:
              await self._try_auto_map_scheme(holding, user_id)
         
         # Pre-fetch NAV history
-        nav_history = []
-        parsed_history = []
+        nav_series = None
         if holding.ticker_symbol and holding.api_source == "MFAPI":
-             nav_history = await self.get_mf_nav_history(holding.ticker_symbol)
-             # Optimize: Pre-parse history
-             try:
-                 for entry in nav_history:
-                     d = datetime.strptime(entry['date'], "%d-%m-%Y").date()
-                     parsed_history.append({'date': d, 'nav': float(entry['nav'])})
-             except: pass
+             nav_series = await self.get_mf_nav_history(holding.ticker_symbol)
         
         # Determine Current NAV
         # Use latest available NAV from history (Safe against API lags/weekends)
         current_nav = 0.0
-        if parsed_history:
-            current_nav = parsed_history[0]['nav']
+        if nav_series is not None:
+            current_nav = float(nav_series.navs[-1])
             
         if current_nav <= 0:
             # Fallback to last snapshot price
@@ -979,23 +1417,15 @@ class WealthService:
         # Test all days from 1st to 28th (Timing Alpha)
         alternative_dates = list(range(1, 29))
         
-        # Calculate performance for each alternative date
-        results = {}
-        
-        for alt_date in alternative_dates:
-            try:
-                performance = await self._calculate_date_performance(
-                    holding=holding,
-                    sip_snapshots=sip_snapshots,
-                    target_date=alt_date,
-                    avg_sip_amount=avg_sip_amount,
-                    current_nav=current_nav,
-                    nav_history=parsed_history
-                )
-                results[alt_date] = performance
-            except Exception as e:
-                logger.error(f"DEBUG: Failed for date {alt_date}: {e}")
-                pass
+        # Calculate performance for every alternative date in one pass
+        results = await self._calculate_date_performances(
+            holding=holding,
+            sip_snapshots=sip_snapshots,
+            target_dates=alternative_dates,
+            avg_sip_amount=avg_sip_amount,
+            current_nav=current_nav,
+            nav_series=nav_series
+        )
         
         # Get user's actual performance
         user_performance = results.get(most_common_date)
@@ -1041,104 +1471,83 @@ class WealthService:
             analysis_end=sip_snapshots[-1].captured_at
         )
     
-    async def _calculate_date_performance(
+    async def _calculate_date_performances(
         self,
         holding: InvestmentHolding,
         sip_snapshots: List[InvestmentSnapshot],
-        target_date: int,
+        target_dates: List[int],
         avg_sip_amount: float,
         current_nav: float,
-        nav_history: List[dict] = None
-    ) -> schemas.SIPDatePerformance:
-        """Calculate performance for a specific SIP date."""
-        simulated_portfolio = []
-        total_units = 0.0
-        total_invested = 0.0
-        
-        # Optimization: Create a lookup map for history if provided
-        # nav_lookup = {row['date']: row['nav'] for row in nav_history} # Expensive to build every time?
-        # Better: Just linear scan or simple lookup helper if passed efficiently
-        
-        for snapshot in sip_snapshots:
-            # Calculate target date in same month/year
-            try:
-                target_dt = snapshot.captured_at.replace(day=target_date)
-            except ValueError:
-                # Handle months with fewer days (e.g., Feb 30)
-                from calendar import monthrange
-                max_day = monthrange(snapshot.captured_at.year, snapshot.captured_at.month)[1]
-                target_dt = snapshot.captured_at.replace(day=min(target_date, max_day))
-            
-            # Fetch NAV for this alternative date
-            # Loop optimization: Use history
-            nav = 0.0
-            if nav_history:
-                nav = self._find_nearest_nav(nav_history, target_dt)
-            
-            if nav <= 0:
-                # Fallback to API/DB if history missing or lookup failed
-                try:
-                    nav = await self.get_asset_price(holding, target_dt)
-                except:
-                    nav = snapshot.price_per_unit # Ultimate Fallback
-            
-            if nav <= 0: nav = 1.0 # Safety
-            
-            # Calculate units
-            units = avg_sip_amount / nav
-            total_units += units
-            total_invested += avg_sip_amount
-            
-            simulated_portfolio.append({
-                "date": target_dt,
-                "amount": avg_sip_amount,
-                "nav": nav,
-                "units": units
-            })
-        
-        # Calculate current value
-        current_value = total_units * current_nav
-        absolute_return = current_value - total_invested
-        return_percentage = (absolute_return / total_invested * 100) if total_invested > 0 else 0
-        
-        # Calculate XIRR
-        xirr = self._calculate_xirr_from_flows(simulated_portfolio, current_value)
-        
-        return schemas.SIPDatePerformance(
-            sip_date=target_date,
-            total_invested=total_invested,
-            current_value=current_value,
-            absolute_return=absolute_return,
-            return_percentage=return_percentage,
-            xirr=xirr
+        nav_series: Optional[NavSeries] = None
+    ) -> Dict[int, schemas.SIPDatePerformance]:
+        """
+        Calculate performance for each SIP day of month in `target_dates`.
+        NAVs for every (SIP month, day) pair are resolved as one matrix, so each
+        alternative date is a column rather than a replay of the whole history.
+        Days must be <= 28 so that every month has them.
+        """
+        n_months = len(sip_snapshots)
+        days = np.asarray(target_dates, dtype=np.int64)
+        month_starts = np.fromiter(
+            (s.captured_at.replace(day=1).toordinal() for s in sip_snapshots),
+            dtype=np.int64,
+            count=n_months
         )
-    
-    def _calculate_xirr_from_flows(self, flows: List[dict], current_value: float) -> Optional[float]:
-        """Calculate XIRR from flow data."""
-        if not flows:
-            return None
-        
-        dates = [f["date"] for f in flows]
-        amounts = [-f["amount"] for f in flows]  # Negative for outflows
-        
-        # Add terminal value
-        dates.append(date.today())
-        amounts.append(current_value)
+        target_ords = month_starts[:, None] + (days - 1)[None, :]
+        
+        navs = np.zeros(target_ords.shape, dtype=np.float64)
+        if nav_series is not None:
+            # Nearest NAV on or before each target (previous trading day)
+            idx = np.searchsorted(nav_series.ordinals, target_ords, side="right") - 1
+            found = idx >= 0
+            navs[found] = nav_series.navs[idx[found]]
+        
+        # Cells the history couldn't price: fall back to API/DB, then the snapshot's own price.
+        # Each distinct date is fetched once, and the fetches run concurrently.
+        missing = list(zip(*np.nonzero(navs <= 0)))
+        if missing:
+            missing_ords = sorted({int(target_ords[row, col]) for row, col in missing})
+            slots = asyncio.Semaphore(PRICE_FETCH_CONCURRENCY)
+
+            async def fetch(ordinal: int) -> float:
+                async with slots:
+                    return await self.get_asset_price(holding, date.fromordinal(ordinal))
+
+            fetched = await asyncio.gather(*(fetch(o) for o in missing_ords), return_exceptions=True)
+            prices = dict(zip(missing_ords, fetched))
+            for row, col in missing:
+                nav = prices[int(target_ords[row, col])]
+                if isinstance(nav, Exception):
+                    nav = sip_snapshots[row].price_per_unit # Ultimate Fallback
+                navs[row, col] = nav if nav > 0 else 1.0 # Safety
+        
+        total_invested = avg_sip_amount * n_months
+        current_values = (avg_sip_amount / navs).sum(axis=0) * current_nav
+        absolute_returns = current_values - total_invested
+        
+        # XIRR flows per date: the SIP outflows, then today's value as the final inflow
+        today_ord = date.today().toordinal()
+        amounts = np.append(np.full(n_months, -avg_sip_amount), 0.0)
         
-        try:
-            dates_ord = [d.toordinal() for d in dates]
-            d0 = dates_ord[0]
-            
-            def xnpv(rate):
-                return sum([a / pow(1 + rate, (d - d0) / 365.0) for a, d in zip(amounts, dates_ord)])
-            
-            def xnpv_prime(rate):
-                return sum([- (d - d0) / 365.0 * a / pow(1 + rate, (d - d0) / 365.0 + 1) for a, d in zip(amounts, dates_ord)])
+        results = {}
+        for col, target_date in enumerate(target_dates):
+            flow_ords = np.append(target_ords[:, col], today_ord).astype(np.float64)
+            amounts[-1] = current_values[col]
+            try:
+                xirr = _xirr(flow_ords - flow_ords[0], amounts) * 100  # Return percentage
+            except:
+                xirr = None
             
-            res = optimize.newton(xnpv, 0.1, fprime=xnpv_prime, maxiter=50)
-            return res * 100  # Return percentage
-        except:
-            return None
+            absolute_return = float(absolute_returns[col])
+            results[target_date] = schemas.SIPDatePerformance(
+                sip_date=target_date,
+                total_invested=total_invested,
+                current_value=float(current_values[col]),
+                absolute_return=absolute_return,
+                return_percentage=(absolute_return / total_invested * 100) if total_invested > 0 else 0,
+                xirr=xirr
+            )
+        return results
     
     def _generate_sip_insight(
         self,
@@ -1203,26 +1612,14 @@ class WealthService:
         
         return f"In the last {total_months} months, SIPs on the {best_date}th outperformed {user_date}th-date SIPs in approximately {wins} out of {total_months} months ({win_rate}% win rate)."
 
-    async def get_mf_nav_history(self, scheme_code: str) -> List[dict]:
-        """Fetch full NAV history from MFAPI."""
-        url = f"https://api.mfapi.in/mf/{scheme_code}"
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.get(url, timeout=10.0)
-                if resp.status_code == 200:
-                    return resp.json().get("data", [])
-            except Exception as e:
-                logger.error(f"Failed to fetch MF history: {e}")
-        return []
-
-    def _find_nearest_nav(self, history: List[dict], target_date: date) -> float:
-        """Find Nearest NAV (Previous Trading Day). History must be sorted Descending (Newest first)."""
-        # Linear scan is O(N) but simple. Since we iterate newest (2024) backwards, 
-        # for a target date in 2024, we find it quickly.
-        for entry in history:
-            if entry['date'] <= target_date:
-                return entry['nav']
-        return 0.0
+    async def get_mf_nav_history(self, scheme_code: str) -> Optional[NavSeries]:
+        """Full NAV history from MFAPI, or None when it can't be fetched or is empty."""
+        try:
+            series = await self._get_mfapi_scheme(scheme_code)
+        except Exception as e:
+            logger.error(f"Failed to fetch MF history: {e}")
+            return None
+        return series if len(series.navs) else None
 
     async def simulate_historical_investment(
         self, 
@@ -1237,23 +1634,8 @@ class WealthService:
         Supports Lumpsum and monthly SIP.
         """
         history = await self.get_mf_nav_history(scheme_code)
-        if not history:
+        if history is None:
              raise ValueError("Could not fetch scheme history")
-        
-        # Data format: [{date: "dd-mm-yyyy", nav: "123.45"}]
-        # Parse first, then sort
-        parsed_history = []
-        for h in history:
-            try:
-                 d = datetime.strptime(h['date'], "%d-%m-%Y").date()
-                 parsed_history.append({'date': d, 'nav': float(h['nav'])})
-            except: pass
-            
-        if not parsed_history:
-            raise ValueError("Invalid history data")
-
-        # Sort ascending by date
-        parsed_history.sort(key=lambda x: x['date'])
             
         start_date = date_obj
         final_date = end_date if end_date else date.today()
@@ -1262,19 +1644,20 @@ class WealthService:
             raise ValueError("End date cannot be before start date")
             
         # Find start NAV
-        start_entry = self._find_entry_closest_to(parsed_history, start_date)
-        if not start_entry:
+        first_date, last_date = history.date_at(0), history.date_at(-1)
+        start_idx = history.index_closest_to(start_date, window=5)
+        if start_idx is None:
             # Try finding ANY entry before or after?
             # If start date is way in the past/future relative to data?
-            if start_date > parsed_history[-1]['date']:
-                raise ValueError(f"Start date {start_date} is in the future relative to available data (Last: {parsed_history[-1]['date']})")
-            if start_date < parsed_history[0]['date']:
+            if start_date > last_date:
+                raise ValueError(f"Start date {start_date} is in the future relative to available data (Last: {last_date})")
+            if start_date < first_date:
                  # Use inception NAV?
-                 start_entry = parsed_history[0]
+                 start_idx = 0
             else:
                  raise ValueError(f"No NAV found near start date {start_date}")
 
-        start_nav = start_entry['nav']
+        start_nav = float(history.navs[start_idx])
         
         total_invested = 0.0
         total_units = 0.0
@@ -1291,16 +1674,16 @@ class WealthService:
             while curr <= final_date:
                 # Find closest NAV for this month's date
                 # Use a wider window (10 days) or fallback to last known
-                entry = self._find_entry_closest_to(parsed_history, curr, window=10)
+                idx = history.index_closest_to(curr, window=10)
                 
-                if not entry:
+                if idx is None:
                     # Fallback: Find the last available NAV before this date
                     # This handles cases where data might be sparse
-                    entry = self._find_last_entry_before(parsed_history, curr)
+                    idx = history.index_on_or_before(curr)
                 
-                if entry:
-                    units = amount / entry['nav']
-                    total_units += units
+                if idx is not None:
+                    units = amount / history.navs[idx]
+                    total_units += float(units)
                     total_invested += amount
                     months_invested += 1
                 else:
@@ -1314,29 +1697,29 @@ class WealthService:
                     y += 1
                 
                 # Try to keep same day, cap at month end
-                import calendar
                 day = min(date_obj.day, calendar.monthrange(y, m)[1])
                 curr = date(y, m, day)
         
         # Calculate final value
-        final_entry = self._find_entry_closest_to(parsed_history, final_date)
-        if not final_entry:
-            final_entry = parsed_history[-1] # Fallback to very last data point available
+        final_idx = history.index_closest_to(final_date, window=5)
+        if final_idx is None:
+            final_idx = len(history.navs) - 1 # Fallback to very last data point available
             
-        current_nav = final_entry['nav']
+        current_nav = float(history.navs[final_idx])
+        final_nav_date = history.date_at(final_idx)
         current_value = total_units * current_nav
         
         abs_return = current_value - total_invested
         pct_return = (abs_return / total_invested * 100) if total_invested > 0 else 0
         
-        notes = f"Simulated {months_invested} installments from {start_date} to {final_entry['date']}."
+        notes = f"Simulated {months_invested} installments from {start_date} to {final_nav_date}."
         if skipped_months > 0:
             notes += f" Skipped {skipped_months} months due to missing data."
 
         return schemas.SimulateInvestmentResponse(
             scheme_code=scheme_code,
             invested_date=start_date,
-            end_date=final_entry['date'],
+            end_date=final_nav_date,
             invested_amount=total_invested,
             start_nav=start_nav,
             current_nav=current_nav,
@@ -1347,36 +1730,21 @@ class WealthService:
             notes=notes
         )
 
-    def _find_entry_closest_to(self, history: List[dict], target: date, window: int = 5) -> Optional[dict]:
-        """Finds closest date entry within +/- window days. Assumes history is sorted asc."""
-        # Optimization: Filter roughly relevant first?
-        # Since history is sorted, we can use bisect-like logic or just linear scan for small N
-        
-        candidates = [x for x in history if abs((x['date'] - target).days) <= window]
-        if not candidates:
-            return None
-        # Sort by proximity
-        candidates.sort(key=lambda x: abs((x['date'] - target).days))
-        return candidates[0]
-
-    def _find_last_entry_before(self, history: List[dict], target: date) -> Optional[dict]:
-        """Finds the last available entry <= target date."""
-        # History is sorted asc
-        # Iterate backwards
-        for i in range(len(history) - 1, -1, -1):
-            if history[i]['date'] <= target:
-                return history[i]
-        return None
-
     async def search_mutual_funds_external(self, query: str) -> List[dict]:
         """Search MFAPI for schemes."""
+        key = mf_search_key(query)
+        cached = mf_search_cache.get(key)
+        if cached is not None:
+            return cached
+        
         url = "https://api.mfapi.in/mf/search"
-        async with httpx.AsyncClient() as client:
-             try:
-                resp = await client.get(url, params={"q": query}, timeout=10.0)
-                if resp.status_code == 200:
-                    return resp.json()
-             except: pass
+        try:
+            resp = await get_http_client().get(url, params={"q": query}, timeout=10.0)
+            if resp.status_code == 200:
+                results = resp.json()
+                mf_search_cache.set(key, results)
+                return results
+        except: pass
         return []
 
     async def _try_auto_map_scheme(self, holding: InvestmentHolding, user_id: uuid.UUID) -> Optional[str]:
@@ -1390,7 +1758,6 @@ class WealthService:
         
         # Construct query: AMC + first 2-3 words of name
         # Remove anything in brackets
-        import re
         clean_base = re.sub(r'\(.*?\)', '', name_lower).replace('-', ' ').strip()
         words = clean_base.split()
         
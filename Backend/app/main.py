@@ -1,5 +1,6 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
@@ -49,9 +50,15 @@ async def lifespan(app: FastAPI):
         
     yield
 
+    from app.features.wealth.service import close_http_client
+    from app.features.wealth.forecasting import shutdown_prophet_pool
+    await close_http_client()
+    shutdown_prophet_pool()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,  # Serializes UUID/datetime/float natively, far faster than stdlib json
     lifespan=lifespan
 )
 #app.router.redirect_slashes = False
@@ -65,13 +72,12 @@ app.add_middleware(
 )
 
 from fastapi import Request
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Global error: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal Server Error", "msg": str(exc)},
     )
@@ -79,7 +85,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     logger.error(f"Validation error: {exc.errors()}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={"detail": exc.errors()},
     )
@@ -0,0 +1,62 @@
+"""
+Lowercase users.email for rows stored before emails were normalized.
+
+Emails that differ only by case (e.g. "Foo@x.com" and "foo@x.com") are
+reported and left untouched; those accounts have to be merged by hand.
+
+Run from Backend/:  python scripts/lowercase_emails.py [--dry-run]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, update, func
+
+from app.core.database import AsyncSessionLocal
+from app.features.auth.models import User
+
+
+async def lowercase_emails(dry_run: bool = False):
+    async with AsyncSessionLocal() as db:
+        lowered = func.lower(User.email)
+
+        # Lowercased emails shared by more than one account
+        collision_stmt = (
+            select(lowered.label("email"), func.array_agg(User.email).label("variants"))
+            .group_by(lowered)
+            .having(func.count(User.id) > 1)
+        )
+        collisions = (await db.execute(collision_stmt)).all()
+        for row in collisions:
+            print(f"  Collision: {row.email} <- {', '.join(row.variants)}")
+        colliding = [row.email for row in collisions]
+
+        # Mixed-case rows whose lowercase form is free
+        pending = [User.email != lowered]
+        if colliding:
+            pending.append(lowered.notin_(colliding))
+
+        if dry_run:
+            count = (await db.execute(select(func.count(User.id)).where(*pending))).scalar()
+            print(f"\nDry run: {count} emails would be lowercased, {len(collisions)} collisions need merging.")
+            return
+
+        stmt = (
+            update(User)
+            .where(*pending)
+            .values(email=lowered)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+        print(f"\nLowercased {result.rowcount} emails, {len(collisions)} collisions need merging.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="Report without updating")
+    args = parser.parse_args()
+    asyncio.run(lowercase_emails(dry_run=args.dry_run))